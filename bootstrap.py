@@ -0,0 +1,103 @@
+#!/usr/bin/env python
+#-*- coding:utf-8 -*-
+##
+## bootstrap.py
+##
+##  Created on: Oct 17, 2026
+##
+
+#
+#==============================================================================
+from load import value_bounds
+import multiprocessing
+import numpy as np
+from util import make_batches, weights
+
+
+#
+#==============================================================================
+def intervals(values, solved, present, rows, options):
+    """
+        Computes bootstrap confidence intervals of the number of solved
+        instances, of the PAR2 score and of the rank of the given rows of
+        the matrices made by load_columns(). Instances are resampled
+        jointly for all the tools; a resample is a vector of weights
+        (the number of times each instance is drawn), thus each batch of
+        resamples is a matrix and the statistics of the tools are its
+        products with the matrices of their data. Batches are shared
+        among processes if more than one job is requested. Returns a
+        dictionary of (rows x 2) arrays of lower and upper bounds.
+    """
+
+    min_val, timeout, max_value = value_bounds(options)
+
+    p = present[rows]
+    s = solved[rows] & p
+    v = np.clip(values[rows], min_val, timeout)
+    v[~s | np.isnan(v)] = timeout
+
+    # matrices whose products with the weights are the statistics
+    data = (s.astype(np.float64), p.astype(np.float64),
+            np.where(p, np.where(s, v, 2 * timeout), 0),
+            np.where(p, np.where(s, v, max_value), 0), options['reverse'])
+
+    batches = make_batches(options['bootstrap'], values.shape[1], options['bootstrap_seed'])
+
+    procs = min(options['jobs'], len(batches))
+    if procs > 1:
+        pool = multiprocessing.Pool(procs, initializer=share_data, initargs=(data,))
+        try:
+            results = pool.map(resample, batches, chunksize=1)
+        finally:
+            pool.close()
+            pool.join()
+    else:
+        share_data(data)
+        results = [resample(b) for b in batches]
+
+    bounds = lambda i: np.percentile(np.vstack([r[i] for r in results]),
+            [50 * (1 - options['bootstrap_conf']), 50 * (1 + options['bootstrap_conf'])],
+            axis=0).T
+
+    return {'solved': bounds(0), 'par2': bounds(1), 'rank': bounds(2)}
+
+
+#
+#==============================================================================
+shared_data = None
+
+
+#
+#==============================================================================
+def share_data(data):
+    """
+        Makes the data of the tools available to resample().
+    """
+
+    global shared_data
+    shared_data = data
+
+
+#
+#==============================================================================
+def resample(batch):
+    """
+        Computes the number of solved instances, the PAR2 score and the
+        rank of the shared tools for a batch of resamples. Tools are
+        ranked as by select().
+    """
+
+    solved, present, par2, series, reverse = shared_data
+    count, size, seed = batch
+
+    w = weights(count, size, np.random.default_rng(seed))
+
+    nsolved, npresent = np.dot(w, solved.T), np.dot(w, present.T)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        scores = np.dot(w, par2.T) / npresent
+        keys = nsolved + np.nan_to_num(npresent / np.dot(w, series.T))
+
+    order = np.argsort(keys if reverse else -keys, axis=1, kind='stable')
+    ranks = np.argsort(order, axis=1) + 1
+
+    return nsolved, scores, ranks
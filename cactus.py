@@ -10,14 +10,16 @@
 
 #
 #==============================================================================
-import json
 import matplotlib.pyplot as plt
 from matplotlib import __version__ as mpl_version
+from matplotlib.collections import LineCollection
+from matplotlib.colors import to_rgb, to_rgba
+from matplotlib.lines import Line2D
 import math
 import numpy as np
 import os
 from plot import Plot
-import six
+from util import band, tex_escape
 
 
 #
@@ -34,20 +36,58 @@ class Cactus(Plot, object):
 
         super(Cactus, self).__init__(options)
 
-        with open(self.def_path, 'r') as fp:
-            self.linestyles = json.load(fp)['cactus_linestyle']
+        # tables of pgfplots pictures must not grow with the instances
+        self.decimate    = options['decimate'] or 'pgfplots' in self.backends
+        self.linestyles  = options['cactus_linestyle']
+        self.mark_every  = options['mark_every']
+        self.mark_gap    = options['mark_gap']
+        self.batch_lines = options['batch_lines']
+        self.lgd_max     = options['lgd_max']
+
+        # plots of many tools have a short legend by default
+        self.lgd_max_batched = options['lgd_max_batched']
+
+        # confidence bands of the lines
+        self.bootstrap      = options['bootstrap']
+        self.bootstrap_conf = options['bootstrap_conf']
+        self.bootstrap_seed = options['bootstrap_seed']
+        self.fills          = []
 
     def create(self, data):
         """
             Does the plotting.
         """
 
+        with self.context():
+            fig, ax = self.figure()
+            self.draw(ax, data)
+            self.save(fig)
+
+    def draw(self, ax, data):
+        """
+            Draws the lines of the tools on the given axes.
+        """
+
+        # axes limits
+        x_lim = (self.x_min, self.x_max if self.x_max else math.ceil(max([d[2] for d in data]) / float(100)) * 100)
+        y_lim = (self.y_min, self.y_max if self.y_max else self.timeout)
+
         # making lines
-        coords = []
+        coords, marks, bands = [], [], []
         for d in data:
-            coords.append(np.arange(1, len(d[1]) + 1))  # xs (separate for each line)
-            coords.append(np.array(sorted(d[1])))
-        lines = plt.plot(*coords, zorder=3)
+            ys = np.sort(d[1])
+            xs = np.arange(1, len(ys) + 1)  # xs (separate for each line)
+
+            if self.decimate:
+                keep = self.thin(ys, x_lim, y_lim)
+                xs, ys = xs[keep], ys[keep]
+
+            coords.extend([xs, ys])
+            if self.bootstrap:
+                bands.append(band(d[1], xs - 1, self.bootstrap, self.bootstrap_conf, self.bootstrap_seed))
+
+            if self.mark_every or self.decimate:
+                marks.append(np.flatnonzero(self.marked(xs, x_lim)).tolist())
 
         # setting line styles
         if self.byname == False:  # by default, assign fist line to best tool
@@ -58,30 +98,43 @@ class Cactus(Plot, object):
             tmap = {tn[1]: i for i, tn in enumerate(tnames)}
             lmap = lambda i: tmap[i]
 
-        for i, l in enumerate(lines):
-            plt.setp(l, **self.linestyles[lmap(i) % len(self.linestyles)])
+        styles = [lmap(i) % len(self.linestyles) for i in range(len(data))]
+
+        # pgfplots pictures need separate lines
+        if len(data) >= self.batch_lines and 'pgfplots' not in self.backends:
+            lines = self.draw_batched(ax, coords, marks, styles)
+        else:
+            lines = ax.plot(*coords, zorder=3)
+
+            for i, l in enumerate(lines):
+                plt.setp(l, **self.linestyles[styles[i]])
+
+                if marks:
+                    l.set_markevery(marks[i])
+
+        self.fills = [ax.fill_betweenx(coords[2 * i + 1], lo, hi, color=lines[i].get_color(),
+            alpha=0.2, lw=0, zorder=2) for i, (lo, hi) in enumerate(bands)]
 
         # turning the grid on
         if not self.no_grid:
-            plt.grid(True, color=self.grid_color, ls=self.grid_style, lw=self.grid_width, zorder=1)
+            ax.grid(True, color=self.grid_color, ls=self.grid_style, lw=self.grid_width, zorder=1)
 
         # axes limits
-        plt.xlim(self.x_min, self.x_max if self.x_max else math.ceil(max([d[2] for d in data]) / float(100)) * 100)
-        plt.ylim(self.y_min, self.y_max if self.y_max else self.timeout)
+        ax.set_xlim(*x_lim)
+        ax.set_ylim(*y_lim)
 
         # axes labels
         if self.x_label:
-            plt.xlabel(self.x_label)
+            ax.set_xlabel(self.x_label)
         else:
-            plt.xlabel('instances')
+            ax.set_xlabel('instances')
 
         if self.y_label:
-            plt.ylabel(self.y_label)
+            ax.set_ylabel(self.y_label)
         else:
-            plt.ylabel('CPU time (s)')
+            ax.set_ylabel('CPU time (s)')
 
         # choosing logarithmic scales if needed
-        ax = plt.gca()
         if self.x_log:
             ax.set_xscale('log')
         if self.y_log:
@@ -106,15 +159,261 @@ class Cactus(Plot, object):
 
         # making the legend
         if self.lgd_loc != 'off':
-            lgtext = [d[0] for d in data]
-            lg = ax.legend(lines, lgtext, ncol=self.lgd_ncol, loc=self.lgd_loc, fancybox=self.lgd_fancy, shadow=self.lgd_shadow if self.lgd_alpha == 1.0 else False)
+            lgd_max = self.lgd_max
+            if not lgd_max and len(data) >= self.batch_lines:
+                lgd_max = self.lgd_max_batched
+
+            shown = list(range(len(data)))
+            if lgd_max and len(data) > lgd_max:  # top tools by the number of solved instances
+                shown = sorted(sorted(shown, key=lambda i: data[i][2], reverse=True)[:lgd_max])
+
+            handles, lgtext = [lines[i] for i in shown], [data[i][0] for i in shown]
+            for i in shown:
+                lines[i].set_label(data[i][0])
+
+            if len(shown) < len(data):
+                handles.append(Line2D([], [], color='grey', lw=1))
+                others = len(data) - len(shown)
+                lgtext.append('{0} other{1}'.format(others, 's' if others > 1 else ''))
+
+            lg = ax.legend(handles, lgtext, ncol=self.lgd_ncol, loc=self.lgd_loc, fancybox=self.lgd_fancy, shadow=self.lgd_shadow if self.lgd_alpha == 1.0 else False)
             fr = lg.get_frame()
             fr.set_lw(1)
             fr.set_alpha(self.lgd_alpha)
             fr.set_edgecolor('black')
 
         # setting frame thickness
-        for i in six.itervalues(ax.spines):
+        for i in ax.spines.values():
             i.set_linewidth(1)
 
-        plt.savefig(self.save_to, bbox_inches='tight', transparent=self.transparent)
+    def draw_batched(self, ax, coords, marks, styles):
+        """
+            Draws all the lines as one collection and the markers of the
+            lines sharing a style as one more line per style. Returns a
+            line of each tool's style to be shown in the legend.
+        """
+
+        # one (unplotted) line per style resolves the aliases of its properties
+        protos = {s: Line2D([], [], **self.linestyles[s]) for s in set(styles)}
+
+        segments = [np.column_stack([coords[2 * i], coords[2 * i + 1]]) for i in range(len(styles))]
+        colors = [to_rgba(protos[s].get_color(), protos[s].get_alpha()) for s in styles]
+
+        ax.add_collection(LineCollection(segments, colors=colors,
+            linewidths=[protos[s].get_linewidth() for s in styles],
+            linestyles=[protos[s].get_linestyle() for s in styles], zorder=3))
+
+        for s, proto in protos.items():
+            group = [i for i in range(len(styles)) if styles[i] == s]
+            if marks:
+                group = [(coords[2 * i][marks[i]], coords[2 * i + 1][marks[i]]) for i in group]
+            else:
+                group = [(coords[2 * i], coords[2 * i + 1]) for i in group]
+
+            l = ax.plot(np.concatenate([g[0] for g in group]),
+                    np.concatenate([g[1] for g in group]), zorder=3)[0]
+            plt.setp(l, **self.linestyles[s])
+            l.set_linestyle('none')
+
+        return [protos[s] for s in styles]
+
+    def thin(self, ys, x_lim, y_lim):
+        """
+            Selects the points of a line (given its sorted values) needed
+            to draw it within a point (or a pixel, whichever is smaller)
+            at the size of the figure. Of each run of consecutive points
+            falling into the same cell, only the first and the last ones
+            are kept, as are the first and the last points of the line,
+            the points around the timeout and the points having markers.
+            Returns the indices of the points to keep.
+        """
+
+        dpi = plt.rcParams['savefig.dpi']
+        if dpi == 'figure':
+            dpi = plt.rcParams['figure.dpi']
+
+        ppi = max(72.0, float(dpi))
+        width, height = self.params['figure.figsize']
+
+        xs = np.arange(1, len(ys) + 1)
+        cells = to_cells(xs, x_lim, int(width * ppi), self.x_log) * (int(height * ppi) + 2) + \
+                to_cells(ys, y_lim, int(height * ppi), self.y_log)
+
+        keep = np.zeros(len(ys), dtype=bool)
+        if len(ys):
+            moves = cells[1:] != cells[:-1]
+            keep[1:] |= moves
+            keep[:-1] |= moves
+            keep[[0, -1]] = True
+
+            # the last point within the timeout and the first one after it
+            bound = np.searchsorted(ys, self.timeout, side='right')
+            keep[max(bound - 1, 0):bound + 1] = True
+
+            keep |= self.marked(xs, x_lim)
+
+        return np.flatnonzero(keep)
+
+    def marked(self, xs, x_lim):
+        """
+            Selects the points of a line (given their positions) having
+            markers: every k-th point if requested and otherwise, for a
+            decimated line, the first point after each step of the given
+            gap along the X axis. The latter are spread evenly whatever
+            points are kept.
+        """
+
+        if self.mark_every:
+            return (xs - 1) % self.mark_every == 0
+
+        width = self.params['figure.figsize'][0] * 72.0
+        cells = to_cells(xs, x_lim, max(1, int(width / self.mark_gap)), self.x_log)
+
+        return np.r_[True, cells[1:] != cells[:-1]] if len(xs) else np.zeros(0, dtype=bool)
+
+    def save_pgfplots(self, fig, filename):
+        """
+            Saves the plot as a pgfplots picture to be included into a
+            LaTeX document. Each line is saved as a data table next to
+            the picture (the tables are referred to by the same path as
+            the picture), and its style is the one it is drawn with.
+            Confidence bands are saved as filled polygons.
+        """
+
+        ax = fig.axes[0]
+        base = os.path.splitext(filename)[0]
+
+        # the picture fits the width of the text, keeping the aspect ratio
+        width, height = self.params['figure.figsize']
+        axis = ['width=\\linewidth, height={0:.3f}\\linewidth'.format(height / width),
+                'xmin={0:g}, xmax={1:g}'.format(*ax.get_xlim()),
+                'ymin={0:g}, ymax={1:g}'.format(*ax.get_ylim()),
+                'xlabel={{{0}}}'.format(tex_escape(ax.get_xlabel())),
+                'ylabel={{{0}}}'.format(tex_escape(ax.get_ylabel()))]
+
+        if self.x_log:
+            axis.append('xmode=log')
+        if self.y_log:
+            axis.append('ymode=log')
+
+        if not self.no_grid:
+            axis.append('grid=major, grid style={{color={0}, {1}, line width={2}pt}}'.format(
+                tex_color(self.grid_color), linestyles.get(self.grid_style, 'solid'),
+                self.grid_width))
+
+        legend = ax.get_legend()
+        labels = [t.get_text() for t in legend.get_texts()] if legend else []
+        if legend:
+            axis.append('legend columns={0}, legend cell align=left'.format(self.lgd_ncol))
+            if self.lgd_loc in locations:
+                axis.append('legend pos={0}'.format(locations[self.lgd_loc]))
+
+        # bands are drawn first, below the lines
+        plots = []
+        for i, fill in enumerate(self.fills):
+            for k, path in enumerate(fill.get_paths()):
+                table = '{0}-band{1}-{2}.dat'.format(base, i, k)
+                np.savetxt(table, path.vertices, fmt='%.6g', header='x y', comments='')
+
+                plots.append('\\addplot [draw=none, fill={0}, fill opacity={1:g}, forget plot] table {{{2}}};'.format(
+                    tex_color(fill.get_facecolor()[0]), fill.get_alpha(), table))
+
+        for i, line in enumerate(ax.get_lines()):
+            table = '{0}-{1}.dat'.format(base, i)
+            np.savetxt(table, np.column_stack([line.get_xdata(), line.get_ydata()]),
+                    fmt='%.6g', header='x y', comments='')
+
+            label = line.get_label() if legend else '_'
+            if label.startswith('_'):  # not shown in the legend
+                plots.append('\\addplot [{0}{1}] table {{{2}}};'.format(pgf_style(line),
+                    ', forget plot' if legend else '', table))
+            else:
+                plots.append('\\addplot [{0}] table {{{1}}};'.format(pgf_style(line), table))
+                plots.append('\\addlegendentry{{{0}}}'.format(tex_escape(label)))
+
+        # the entry summarising the tools not shown in the legend
+        if legend and len(labels) > len([p for p in plots if p.startswith('\\addlegendentry')]):
+            plots.append('\\addlegendimage{{{0}}}'.format(pgf_style(legend.get_lines()[-1])))
+            plots.append('\\addlegendentry{{{0}}}'.format(tex_escape(labels[-1])))
+
+        with open(filename, 'w') as fp:
+            fp.write('% requires \\usepackage{pgfplots}\n')
+            fp.write('\\begin{tikzpicture}\n\\begin{axis}[\n')
+            fp.write(',\n'.join(['    ' + a for a in axis]) + '\n]\n')
+            fp.write('\n'.join(plots) + '\n')
+            fp.write('\\end{axis}\n\\end{tikzpicture}\n')
+
+
+#
+#==============================================================================
+def to_cells(vals, lim, size, log):
+    """
+        Maps the values to the cells of a grid of the given size spanning
+        the axis limits. Values out of the limits are mapped to the cells
+        right before and after the grid.
+    """
+
+    lo, hi = lim
+    if log:
+        lo = lo if lo > 0 else vals[vals > 0].min(initial=1.0)
+        vals, lo, hi = np.log10(np.maximum(vals, lo)), np.log10(lo), np.log10(hi)
+
+    if hi <= lo:
+        return np.zeros(len(vals), dtype=np.int64)
+
+    cells = np.floor((vals - lo) * (size / float(hi - lo)))
+    return np.clip(cells, -1, size).astype(np.int64)
+
+
+#
+#==============================================================================
+# pgfplots counterparts of matplotlib line styles, markers and legend locations
+linestyles = {'-': 'solid', '--': 'dashed', ':': 'dotted', '-.': 'dashdotted'}
+
+markers = {'o': ('*', 0), '^': ('triangle*', 0), 'v': ('triangle*', 180),
+        '<': ('triangle*', 90), '>': ('triangle*', 270), 's': ('square*', 0),
+        'D': ('diamond*', 0), 'd': ('diamond*', 0), 'p': ('pentagon*', 0),
+        'H': ('pentagon*', 0), 'h': ('pentagon*', 0), '*': ('star', 0),
+        'x': ('x', 0), '+': ('+', 0), '.': ('*', 0)}
+
+locations = {'upper left': 'north west', 'upper right': 'north east',
+        'lower left': 'south west', 'lower right': 'south east'}
+
+
+#
+#==============================================================================
+def pgf_style(line):
+    """
+        Makes the pgfplots options reproducing the style of a line.
+    """
+
+    opts = ['color={0}'.format(tex_color(line.get_color())),
+            'line width={0:g}pt'.format(line.get_linewidth()),
+            linestyles.get(line.get_linestyle(), 'solid')]
+
+    if line.get_alpha() is not None:
+        opts.append('opacity={0:g}'.format(line.get_alpha()))
+
+    if line.get_marker() in markers:
+        mark, angle = markers[line.get_marker()]
+        opts.append('mark={0}, mark size={1:g}pt'.format(mark, line.get_markersize() / 2.0))
+        opts.append('mark options={{solid, fill={0}, draw={1}, line width={2:g}pt, rotate={3}}}'.format(
+            tex_color(line.get_markerfacecolor()), tex_color(line.get_markeredgecolor()),
+            line.get_markeredgewidth(), angle))
+
+        if line.get_markevery() is not None:
+            opts.append('mark indices={{{0}}}'.format(','.join([str(i + 1) for i in line.get_markevery()])))
+    else:
+        opts.append('no markers')
+
+    return ', '.join(opts)
+
+
+#
+#==============================================================================
+def tex_color(color):
+    """
+        Converts a matplotlib color into an xcolor expression.
+    """
+
+    return '{{rgb,1:red,{0:.3f};green,{1:.3f};blue,{2:.3f}}}'.format(*to_rgb(color))
@@ -0,0 +1,229 @@
+#!/usr/bin/env python
+#-*- coding:utf-8 -*-
+##
+## daemon.py
+##
+##  Created on: Oct 17, 2026
+##
+
+#
+#==============================================================================
+import collections
+import io
+import json
+import os
+import socket
+import socketserver
+import stat
+import struct
+import sys
+
+
+#
+#==============================================================================
+class DaemonException(Exception):
+    pass
+
+
+#
+#==============================================================================
+class Daemon(socketserver.UnixStreamServer, object):
+    """
+        Server creating plots requested over a Unix domain socket. A
+        request is a command line of mkplot.py along with the working
+        directory of the client; the reply holds the output of the
+        request (e.g. of a dry run), the list of files created and, if
+        asked, their contents. Requests are processed one at a time.
+
+        Plotting modules are loaded once, and the data read from the
+        input files is kept for the most recently used sets of files
+        (until the files change).
+    """
+
+    def __init__(self, path, cache_size=8):
+        """
+            Constructor.
+        """
+
+        self.cache = collections.OrderedDict()
+        self.cache_size = cache_size
+
+        if os.path.exists(path):
+            if not stat.S_ISSOCK(os.stat(path).st_mode):
+                raise DaemonException('\'{0}\' exists and is not a socket.'.format(path))
+
+            try:
+                request(path, None)
+            except socket.error:
+                os.remove(path)  # left by a daemon that is not running
+            else:
+                raise DaemonException('A daemon is already listening on \'{0}\'.'.format(path))
+
+        super(Daemon, self).__init__(path, Handler)
+
+        # loading the renderer
+        import matplotlib
+        matplotlib.use('pdf')  # for not loading GUI modules
+
+        import cactus
+        import scatter
+
+    def server_close(self):
+        """
+            Stops listening and removes the socket.
+        """
+
+        super(Daemon, self).server_close()
+
+        if os.path.exists(self.server_address):
+            os.remove(self.server_address)
+
+    def read(self, files, options, keys=None):
+        """
+            Reads the input files (see read_data()) unless they were read
+            with the same keys before and have not changed since.
+        """
+
+        from load import read_data
+
+        stamps = [(os.path.realpath(f), os.path.getmtime(f), os.path.getsize(f)) for f in files]
+        key = json.dumps([stamps, keys if keys else [options['key']], options['dtype']])
+
+        if key in self.cache:
+            self.cache[key] = self.cache.pop(key)  # the most recently used
+        else:
+            self.cache[key] = read_data(files, options, keys=keys)
+
+            while len(self.cache) > self.cache_size:
+                self.cache.popitem(last=False)
+
+        return self.cache[key]
+
+    def process(self, args, cwd):
+        """
+            Runs a command line in a working directory. Returns its exit
+            status, its output and the list of files created.
+        """
+
+        import mkplot
+
+        stdout, wd = sys.stdout, os.getcwd()
+        sys.stdout = output = io.StringIO()
+
+        status, files = 0, []
+        try:
+            os.chdir(cwd)
+
+            options, fns = mkplot.parse_options(args)
+            files = [os.path.join(cwd, f) for f in mkplot.make_plots(fns, options, reader=self.read)]
+        except SystemExit as err:  # e.g. help or wrong options
+            status = err.code if isinstance(err.code, int) else 1
+        finally:
+            sys.stdout = stdout
+            os.chdir(wd)
+
+        return status, output.getvalue(), files
+
+
+#
+#==============================================================================
+class Handler(socketserver.BaseRequestHandler, object):
+    """
+        Handler of a single request to a daemon.
+    """
+
+    def handle(self):
+        """
+            Processes a request and sends the reply.
+        """
+
+        req = recv_msg(self.request)
+        if req is None:
+            return  # checking whether the daemon is alive
+
+        reply = {'status': 0, 'output': '', 'files': [], 'sizes': [], 'error': None}
+        contents = []
+
+        try:
+            reply['status'], reply['output'], reply['files'] = self.server.process(req['args'], req['cwd'])
+
+            if req['send']:
+                for f in reply['files']:
+                    with open(f, 'rb') as fp:
+                        contents.append(fp.read())
+
+                reply['sizes'] = [len(c) for c in contents]
+        except Exception as err:
+            reply['status'], reply['error'] = 1, '{0}: {1}'.format(type(err).__name__, err)
+
+        send_msg(self.request, reply, b''.join(contents))
+
+
+#
+#==============================================================================
+def request(path, args, send=False):
+    """
+        Sends a command line to the daemon listening on a socket. The
+        paths in the command line are relative to the current directory.
+        Returns the reply of the daemon and the contents of the files
+        created (if requested).
+    """
+
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(path)
+
+        if args is None:
+            send_msg(sock, None)
+            return None, []
+
+        send_msg(sock, {'args': list(args), 'cwd': os.getcwd(), 'send': send})
+
+        reply = recv_msg(sock)
+        contents = [recv_exact(sock, size) for size in reply['sizes']]
+    finally:
+        sock.close()
+
+    return reply, contents
+
+
+#
+#==============================================================================
+def send_msg(sock, header, payload=b''):
+    """
+        Sends a message: the size of its JSON header, the header and a
+        binary payload (the size of which is given in the header).
+    """
+
+    data = json.dumps(header).encode('utf-8')
+    sock.sendall(struct.pack('>I', len(data)) + data + payload)
+
+
+#
+#==============================================================================
+def recv_msg(sock):
+    """
+        Receives the JSON header of a message.
+    """
+
+    size = struct.unpack('>I', recv_exact(sock, 4))[0]
+    return json.loads(recv_exact(sock, size).decode('utf-8'))
+
+
+#
+#==============================================================================
+def recv_exact(sock, size):
+    """
+        Receives the given number of bytes.
+    """
+
+    chunks = []
+    while size:
+        chunk = sock.recv(min(size, 1 << 20))
+        if not chunk:
+            raise DaemonException('Connection closed unexpectedly.')
+
+        chunks.append(chunk)
+        size -= len(chunk)
+
+    return b''.join(chunks)
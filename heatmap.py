@@ -0,0 +1,75 @@
+#!/usr/bin/env python
+#-*- coding:utf-8 -*-
+##
+## heatmap.py
+##
+##  Created on: Oct 17, 2026
+##
+
+#
+#==============================================================================
+import numpy as np
+from plot import Plot
+
+
+#
+#==============================================================================
+class Heatmap(Plot, object):
+    """
+        Heatmap of a pairwise comparison of tools (see compare()). Cell
+        [a][b] shows the share of the instances decided between tools a
+        and b that a wins; the numbers of wins are written in the cells
+        if there are few tools.
+    """
+
+    def __init__(self, options):
+        """
+            Heatmap constructor.
+        """
+
+        super(Heatmap, self).__init__(options)
+
+        self.cell_style = options['heatmap_style']
+
+    def create(self, pairs):
+        """
+            Does the plotting.
+        """
+
+        with self.context():
+            fig, ax = self.figure()
+            self.draw(ax, pairs)
+            self.save(fig)
+
+    def draw(self, ax, pairs):
+        """
+            Draws the matrix of the shares of wins on the given axes.
+        """
+
+        tools = pairs['tools']
+        wins = np.array(pairs['wins'], dtype=np.float64).reshape(len(tools), len(tools))
+
+        with np.errstate(invalid='ignore'):
+            share = wins / (wins + wins.T)
+        np.fill_diagonal(share, np.nan)
+
+        image = ax.imshow(share, cmap=self.cell_style['cmap'], vmin=0, vmax=1, interpolation='nearest')
+        ax.figure.colorbar(image, ax=ax).set_label('share of wins')
+
+        if len(tools) <= self.cell_style['max_annotated']:
+            for (a, b), w in np.ndenumerate(wins):
+                if a != b:
+                    ax.text(b, a, '{0:d}'.format(int(w)), ha='center', va='center',
+                            fontsize=self.cell_style['fontsize'])
+
+        ax.set_xticks(range(len(tools)))
+        ax.set_yticks(range(len(tools)))
+        ax.set_xticklabels(tools, rotation=90)
+        ax.set_yticklabels(tools)
+
+        ax.set_xlabel(self.x_label if self.x_label else 'opponent')
+        ax.set_ylabel(self.y_label if self.y_label else 'tool')
+
+        # setting frame thickness
+        for i in ax.spines.values():
+            i.set_linewidth(1)
@@ -10,41 +10,149 @@
 
 #
 #==============================================================================
-import csv
 import json
+import numpy as np
+import os
+from pack import is_pack, ResultsPack
+from statcache import StatCache
 import statutil
-import six
-import sys
 
 
 #
 #==============================================================================
 def load_data(files, options):
     """
-        Loads data from the input files.
+        Loads data from the input files. The format of each file is
+        detected beforehand; files of different formats (or several
+        results packs) are merged into one StatMatrix object.
     """
 
-    try:  # if JSON data
-        return load_json(statutil.StatArray(files), options)
-    except statutil.JSONException as e:
-        sys.stderr.write('\033[33;1mWarning:\033[m ' + str(e) + '\033[m\n')
-        sys.stderr.write('Probably not a JSON format. Trying to read as CSV.\n')
+    return load_matrix(read_data(files, options), options)
 
-        # reading CSV
-        # expecting exactly one input file
-        with open(files[0], 'r') as fp:
-            # try:
-            rows = csv.reader(fp, delimiter=' ', quotechar='|')
-            rows = [row for row in rows]
 
-            stats = []
-            names = [n.strip() for n in rows[0][1:] if n.strip()]
-            for row in rows[1:]:
-                stats.append([val.strip() for val in row[1:] if val.strip()])
+#
+#==============================================================================
+def read_data(files, options, keys=None):
+    """
+        Reads the input files into one StatMatrix object, which can then
+        be loaded with different options (see load_matrix()). Only the
+        given keys are kept (by default, the measured key).
+    """
+
+    if keys is None:
+        keys = [options['key']]
+
+    groups = {'json': [], 'csv': [], 'pack': []}
+    for f in files:
+        groups[sniff_format(f)].append(f)
+
+    if len(groups['json']) == len(files):
+        return read_json(files, options, keys).core
+    elif len(groups['csv']) == len(files):
+        headers = [read_header(f) for f in files]
+
+        # a single table possibly split into several files
+        if all(h == headers[0] for h in headers):
+            values = np.vstack([read_csv(f)[1] for f in files])
+            return statutil.StatMatrix.from_table(headers[0],
+                    range(values.shape[0]), values, keys)
+    elif len(groups['pack']) == len(files) == 1:
+        return ResultsPack.read(files[0])
+
+    matrices = [ResultsPack.read(f) for f in groups['pack']]
+
+    if groups['json']:
+        matrices.append(read_json(groups['json'], options, keys).core)
+
+    for f in groups['csv']:
+        names, values, insts = read_csv(f, with_insts=True)
+        matrices.append(statutil.StatMatrix.from_table(names, insts, values,
+            keys, origin=f))
+
+    return statutil.StatMatrix.concat(matrices)
+
+
+#
+#==============================================================================
+def sniff_format(filename):
+    """
+        Detects the format of a file by its first bytes and extension.
+    """
+
+    if is_pack(filename):
+        return 'pack'
+
+    ext = os.path.splitext(statutil.strip_ext(filename))[1].lower()
+    if ext in ('.json', '.csv'):
+        return ext[1:]
+
+    with statutil.open_file(filename, 'r') as fp:
+        head = fp.read(4096).lstrip()
 
-            return load_csv(names, stats, options)
-            # except:
-            #     sys.stderr.write('\033[31;1mError:\033[m Unable to read input file(s).\n')
+    return 'json' if head.startswith('{') else 'csv'
+
+
+#
+#==============================================================================
+def read_json(files, options, keys=None):
+    """
+        Reads STAT files into a StatArray object. Only the status and the
+        given keys (by default, the measured key) are kept for each
+        instance.
+    """
+
+    if keys is None:
+        keys = [options['key']]
+
+    cache = None
+    if options['cache_dir']:
+        cache = StatCache(options['cache_dir'], max_size=options['cache_size'],
+                max_age=options['cache_age'])
+
+    stat_arr = statutil.StatArray(files, jobs=options['jobs'],
+            keys=['status'] + keys, cache=cache,
+            dtype=np.dtype(options['dtype']))
+
+    if cache:
+        cache.evict()
+
+    return stat_arr
+
+
+#
+#==============================================================================
+def read_header(filename):
+    """
+        Reads tool names from the header of a CSV table.
+    """
+
+    with statutil.open_file(filename, 'r') as fp:
+        return [n.strip() for n in fp.readline().split()[1:]]
+
+
+#
+#==============================================================================
+def read_csv(filename, with_insts=False):
+    """
+        Reads a space-separated CSV table into a list of tool names and
+        a float matrix of values (instances by tools). The first column
+        is expected to contain instance names, which are returned only
+        if requested.
+    """
+
+    with statutil.open_file(filename, 'r') as fp:
+        names = [n.strip() for n in fp.readline().split()[1:]]
+        values = np.loadtxt(fp, dtype=np.float64, comments=None,
+                usecols=range(1, len(names) + 1), ndmin=2)
+
+    if not with_insts:
+        return names, values
+
+    with statutil.open_file(filename, 'r') as fp:
+        insts = np.loadtxt(fp, dtype=str, comments=None, usecols=0,
+                skiprows=1, ndmin=1).tolist()
+
+    return names, values, insts
 
 
 #
@@ -54,115 +162,86 @@ def load_json(stat_arr, options):
         Loads runtime data from STAT objects.
     """
 
+    return load_matrix(stat_arr.core, options)
+
+
+#
+#==============================================================================
+def load_matrix(matrix, options):
+    """
+        Loads runtime data from a StatMatrix object (the core of a
+        StatArray or a results pack) operating on whole columns.
+    """
+
+    labels, values, solved, present, insts = load_columns(matrix, options)
+    min_val, timeout, max_value = value_bounds(options)
+
+    data = []
+    for j, label in enumerate(labels):
+        rows = present[j]
+        data.append(make_series(label, values[j, rows], solved[j, rows],
+            min_val, timeout, max_value))
+
+    return select(data, options)
+
+
+#
+#==============================================================================
+def load_columns(matrix, options):
+    """
+        Loads the solver-major matrices of the values of the measured key
+        and of the status of the tools (followed by the VBSes, if any)
+        along with the mask of the instances run by each of them. Returns
+        the labels of the rows and the three matrices.
+    """
+
     # preparing data
     if options['join_key']:
-        stat_arr.cluster(use_key=options['join_key'])
+        matrix = matrix.cluster(use_key=options['join_key'])
 
-    data = []
+    timeout = float(options['timeout'])
 
-    # choosing the minimal value
-    min_val = 0.000000001
-    if options['plot_type'] == 'scatter':
-        if options['x_min']:
-            min_val = max(options['x_min'], options['y_min'])
-        else:
-            min_val = options['y_min']  # options['y_min'] is always defined
+    values = matrix.metrics.get(options['key'])
+    if values is None:  # the key is never measured
+        values = np.full(matrix.status.shape, np.nan)
 
-    # processing (normal) separate data
-    for stat_obj in stat_arr:
-        vals = []
-        num_solved = 0
-
-        last_val = -1
-        for inst in stat_obj.insts_own:  # insts_own are sorted
-            if options['key'] in stat_obj.data[inst]:
-                val = stat_obj.data[inst][options['key']]
-            else:
-                val = float(options['timeout'])
-            if stat_obj.data[inst]['status'] == True:
-                if val > last_val:
-                    last_val = val
-
-                if val >= float(options['timeout']):
-                    val = float(options['timeout'])
-                elif val <= min_val:
-                        val = min_val
-
-                num_solved += 1
-            else:
-                val = float(options['timeout'])
-                if options['plot_type'] == 'cactus':
-                    val *= 10
-
-            vals.append(val)
-
-        if type(options['legend']) is list:
-            label = ' '.join([stat_obj.preamble[k] for k in options['legend']])
-        else:
-            label = stat_obj.preamble[options['legend']]
+    labels = [get_label(preamble, options) for preamble in matrix.preambles]
 
-        label = label.strip()
-        data.append((label, vals, num_solved, last_val))
+    # values of CSV tables are solved only if below the timeout
+    solved = matrix.status
+    tables = [j for j, preamble in enumerate(matrix.preambles) if 'table' in preamble]
+    if tables:
+        solved = np.array(solved)
+        with np.errstate(invalid='ignore'):
+            solved[tables] &= values[tables] < timeout
 
-    # processing VBSes
+    # VBSes solve all the instances solved by any of their tools
     if options['vbs']:
-        for vbs_name, tools in options['vbs'].items():
-            max_value = float(options['timeout']) if options['plot_type'] == 'scatter' else 10 * float(options['timeout'])
-            vals = { i: max_value for i in stat_arr.inst_full}
-            num_solved = 0
-
-            if tools != 'all':
-                for stat_obj in stat_arr:
-                    if type(options['legend']) is list:
-                        p = ' '.join([stat_obj.preamble[k] for k in options['legend']])
-                    else:
-                        p = stat_obj.preamble[options['legend']]
-
-                    p = p.strip()
-
-                    if p in tools:
-                        for inst, d in six.iteritems(stat_obj.data):
-                            if d['status'] == True:
-                                if d[options['key']] >= float(options['timeout']):
-                                    d[options['key']] = max_value
-                                elif vals[inst] >= max_value:
-                                    num_solved += 1
-
-                                vals[inst] = max([min_val, min([d[options['key']], vals[inst]])])
-            else:  # VBS among all the tools
-                for stat_obj in stat_arr:
-                    for inst, d in six.iteritems(stat_obj.data):
-                        if d['status'] == True:
-                            if d[options['key']] >= float(options['timeout']):
-                                d[options['key']] = max_value
-                            elif vals[inst] >= max_value:
-                                num_solved += 1
-
-                            vals[inst] = max([min_val, min([d[options['key']], vals[inst]])])
-
-            last_val = -1
-            for v in six.itervalues(vals):
-                if v > last_val and v < max_value:
-                    last_val = v
-
-            data.append((vbs_name, [vals[i] for i in stat_arr.inst_full], num_solved, last_val))
+        with np.errstate(invalid='ignore'):
+            best = np.where(matrix.status & (values < timeout), values, np.inf)
 
-    if options['only']:
-        data = [d for d in data if d[0] in options['only']]
+        vbses = make_vbs(best, labels, options['vbs'])
 
-    if options['repls']:
-        data = [(options['repls'][n], v, s, l) if n in options['repls'] else (n, v, s, l) for n, v, s, l in data]
+        labels = labels + [vbs_name for vbs_name, vals in vbses]
+        values = np.vstack([values] + [vals for vbs_name, vals in vbses])
+        solved = np.vstack([solved] + [np.isfinite(vals) for vbs_name, vals in vbses])
+        present = np.vstack([matrix.present, np.ones((len(vbses), values.shape[1]), dtype=bool)])
+    else:
+        present = matrix.present
 
-    return sorted(data, key=lambda x: x[2] + len(x[1]) / sum(x[1]), reverse=not options['reverse'])
+    return labels, values, solved, present, matrix.insts
 
 
 #
 #==============================================================================
-def load_csv(names, stats, options):
+def value_bounds(options):
     """
-        Loads runtime CSV data.
+        Returns the smallest value shown, the timeout and the value of
+        unsolved instances for the type of the plot.
     """
 
+    timeout = float(options['timeout'])
+
     # choosing the minimal value
     min_val = 0.000000001
     if options['plot_type'] == 'scatter':
@@ -171,91 +250,93 @@ def load_csv(names, stats, options):
         else:
             min_val = options['y_min']  # options['y_min'] is always defined
 
-    names_orig = names[:]
+    max_value = timeout if options['plot_type'] == 'scatter' else 10 * timeout
+
+    return min_val, timeout, max_value
 
-    if options['repls']:
-        names = [options['repls'][n] if n in options['repls'] else n for n in names]
 
-    # processing (normal) separate data
-    lens = [0 for n in names]
-    vals_all = [[] for n in names]
-    last_vals = [-1 for n in names]
+#
+#==============================================================================
+def make_vbs(best, labels, vbses):
+    """
+        Computes the values of VBSes given a solver-major matrix of the
+        values of solved instances (infinite for unsolved ones). Each
+        VBS is defined by a list of solver labels or 'all' and is the
+        column-wise minimum over the rows of its solvers. Returns a list
+        of (name, values) pairs; the input matrix is not modified.
+    """
 
-    for vlist in stats:
-        vlist = [float(val) for val in vlist]
+    result = []
+    for vbs_name, tools in vbses.items():
+        if tools != 'all':
+            rows = [j for j, label in enumerate(labels) if label in tools]
+            vals = best[rows].min(axis=0) if rows else np.full(best.shape[1], np.inf)
+        else:  # VBS among all the tools
+            vals = best.min(axis=0)
 
-        for i, val in enumerate(vlist):
-            if val < float(options['timeout']):
-                if val > last_vals[i]:
-                    last_vals[i] = val
+        result.append((vbs_name, vals))
 
-                if val < min_val:
-                    val = min_val
+    return result
 
-                lens[i] += 1
-            else:
-                val = float(options['timeout'])
-                if options['plot_type'] == 'cactus':
-                    val *= 10
 
-            vals_all[i].append(val)
+#
+#==============================================================================
+def make_series(label, vals, solved, min_val, timeout, max_value):
+    """
+        Makes the data tuple of a tool: its label, its values (solved
+        ones are clamped to [min_val, timeout], unsolved ones are set to
+        max_value), the number of solved instances and the largest value
+        among the solved ones. Missing (NaN) values are timeouts.
+    """
 
-    # processing VBSes
-    if options['vbs']:
-        for vbs_name, tools in options['vbs'].items():
-            vals = []
-            len_ = 0
-            last_val = -1
+    vals = np.where(np.isnan(vals), timeout, vals)
 
-            if tools != 'all':
-                tools = [n if n in tools else '' for n in names_orig]
+    last_val = float(vals[solved].max()) if solved.any() else -1
+    vals = np.where(solved, np.clip(vals, min_val, timeout), max_value)
 
-                for vlist in stats:
-                    vlist = [float(val) for i, val in enumerate(vlist) if tools[i]]
-                    val = min(vlist)
+    return (label, vals, int(solved.sum()), last_val)
 
-                    if val < float(options['timeout']):
-                        if val > last_val:
-                            last_val = val
 
-                        if val < min_val:
-                            val = min_val
+#
+#==============================================================================
+def get_label(preamble, options):
+    """
+        Makes the legend label of a tool from its preamble. Tools read
+        from CSV tables are labelled by their name.
+    """
 
-                        len_ += 1
-                    else:
-                        val = options['timeout']
-                        if options['plot_type'] == 'cactus':
-                            val *= 10
+    if 'table' in preamble:
+        return preamble['program']
 
-                    vals.append(val)
-            else:  # VBS among all the tools
-                for vlist in stats:
-                    val = min([float(val) for val in vlist])
+    keys = options['legend'] if type(options['legend']) is list else [options['legend']]
+    return ' '.join([preamble[k] for k in keys]).strip()
 
-                    if val < float(options['timeout']):
-                        if val > last_val:
-                            last_val = val
 
-                        if val < min_val:
-                            val = min_val
+#
+#==============================================================================
+def select(data, options):
+    """
+        Filters, renames and ranks the loaded data.
+    """
 
-                        len_ += 1
-                    else:
-                        val = options['timeout']
-                        if options['plot_type'] == 'cactus':
-                            val *= 10
+    if options['only']:
+        data = [d for d in data if d[0] in options['only']]
 
-                    vals.append(val)
+    if options['repls']:
+        data = [(options['repls'][n], v, s, l) if n in options['repls'] else (n, v, s, l) for n, v, s, l in data]
 
-            names.append(vbs_name)
-            names_orig.append(vbs_name)
-            vals_all.append(vals)
-            lens.append(len_)
-            last_vals.append(last_val)
+    return sorted(data, key=lambda x: x[2] + len(x[1]) / float(np.sum(x[1])), reverse=not options['reverse'])
 
-    data = [[n, t, s, l] for n, t, s, l in zip(names, vals_all, lens, last_vals)]
 
-    if options['only']:
-        data = [d for i, d in enumerate(data) if names_orig[i] in options['only']]
+#
+#==============================================================================
+def load_csv(names, values, options):
+    """
+        Loads runtime CSV data given as a matrix of values, in which
+        column i corresponds to the tool names[i].
+    """
+
+    matrix = statutil.StatMatrix.from_table(names, range(values.shape[0]),
+            values, [options['key']])
 
-    return sorted(data, key=lambda x: x[2] + len(x[1]) / sum(x[1]), reverse=not options['reverse'])
+    return load_matrix(matrix, options)
@@ -0,0 +1,156 @@
+#!/usr/bin/env python
+#-*- coding:utf-8 -*-
+##
+## mkpack.py
+##
+##  Created on: Oct 17, 2026
+##
+
+#
+#==============================================================================
+import getopt
+import os
+from pack import ResultsPack
+from statutil import StatArray, strip_ext
+import sys
+
+
+#
+#==============================================================================
+def parse_options():
+    """
+        Parses command-line options:
+    """
+
+    try:
+        opts, args = getopt.gnu_getopt(sys.argv[1:],
+                                       'fhk:o:',
+                                       ['force',
+                                        'help',
+                                        'jobs=',
+                                        'keys=',
+                                        'output='])
+    except getopt.GetoptError as err:
+        sys.stderr.write(str(err).capitalize() + '\n')
+        usage()
+        sys.exit(1)
+
+    options = {'force': False, 'jobs': 1, 'keys': ['rtime'], 'output': None}
+
+    for opt, arg in opts:
+        if opt in ('-f', '--force'):
+            options['force'] = True
+        elif opt in ('-h', '--help'):
+            usage()
+            sys.exit(0)
+        elif opt == '--jobs':
+            options['jobs'] = int(arg)
+        elif opt in ('-k', '--keys'):
+            options['keys'] = [k.strip() for k in str(arg).split(',')]
+        elif opt in ('-o', '--output'):
+            options['output'] = str(arg)
+        else:
+            assert False, 'Unhandled option: {0} {1}'.format(opt, arg)
+
+    if not args or args[0] not in ('pack', 'unpack') or len(args) < 2:
+        usage()
+        sys.exit(1)
+
+    return options, args[0], args[1:]
+
+
+#
+#==============================================================================
+def usage():
+    """
+        Prints usage message.
+    """
+
+    print('Usage:', os.path.basename(sys.argv[0]), ' [options] pack stat-files')
+    print('      ', os.path.basename(sys.argv[0]), ' [options] unpack pack-file')
+    print('Options:')
+    print('        -f, --force                     Overwrite existing files when unpacking')
+    print('        -h, --help                      Show this message')
+    print('        --jobs=<int>                    Number of processes used to read STAT files')
+    print('                                        Available values: [1 .. INT_MAX] (default = 1)')
+    print('        -k, --keys=<string-list>        Comma-separated list of keys to store in a pack')
+    print('                                        Format: "rtime,mempeak" (default = rtime)')
+    print('        -o, --output=<string>           Pack file to create or directory to unpack to')
+    print('                                        Default value: results.pack or current directory')
+
+
+#
+#==============================================================================
+def origin_names(origins):
+    """
+        Makes the names of STAT files stored in a pack: their paths
+        relative to the deepest directory containing all of them.
+    """
+
+    paths = [os.path.abspath(f) for f in origins]
+    if not paths:
+        return []
+
+    top = os.path.commonpath([os.path.dirname(f) for f in paths])
+    return [os.path.relpath(f, top) for f in paths]
+
+
+#
+#==============================================================================
+def unpack_names(origins):
+    """
+        Makes the names of the files unpacked from a pack given the
+        names of their origins. Compression extensions are removed,
+        since the files are written uncompressed, and clashing names get
+        an index.
+    """
+
+    names, seen = [], set()
+    for origin in origins:
+        name = os.path.normpath(strip_ext(origin))
+        if os.path.isabs(name) or name.startswith(os.pardir):
+            name = os.path.basename(name)  # not to write out of the directory
+
+        root, ext = os.path.splitext(name)
+        k = 1
+        while name in seen:
+            name = '{0}-{1}{2}'.format(root, k, ext)
+            k += 1
+
+        seen.add(name)
+        names.append(name)
+
+    return names
+
+
+#
+#==============================================================================
+if __name__ == '__main__':
+    options, command, fns = parse_options()
+
+    if command == 'pack':
+        stat_arr = StatArray(fns, jobs=options['jobs'], keys=['status'] + options['keys'])
+        pack = ResultsPack.from_matrix(stat_arr.core)
+
+        names = origin_names([preamble['origin'] for preamble in pack.preambles])
+        for preamble, name in zip(pack.preambles, names):
+            preamble['origin'] = name
+
+        pack.write(options['output'] if options['output'] else 'results.pack')
+    else:
+        outdir = options['output'] if options['output'] else '.'
+
+        stat_arr = ResultsPack.read(fns[0]).to_stats()
+        names = [os.path.join(outdir, name) for name in
+                unpack_names([stat_obj.preamble['origin'] for stat_obj in stat_arr])]
+
+        existing = [f for f in names if os.path.exists(f)]
+        if existing and not options['force']:
+            sys.stderr.write('File \'{0}\' exists, use --force to overwrite it\n'.format(existing[0]))
+            sys.exit(1)
+
+        for stat_obj, f in zip(stat_arr, names):
+            if not os.path.isdir(os.path.dirname(f) or '.'):
+                os.makedirs(os.path.dirname(f))
+
+            stat_obj.write(f)
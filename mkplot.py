@@ -10,51 +10,69 @@
 
 #
 #==============================================================================
-from __future__ import print_function
-import matplotlib
-matplotlib.use('pdf')  # for not loading GUI modules
-
-from cactus import Cactus
 import getopt
 import json
-from load import load_data
+import multiprocessing
 import os
-from scatter import Scatter
+import signal
 import sys
 
 
 #
 #==============================================================================
-def parse_options():
+class OptionsException(Exception):
+    pass
+
+
+#
+#==============================================================================
+def parse_options(argv=None):
     """
-        Parses command-line options:
+        Parses command-line options (by default, of the script itself):
     """
 
     try:
-        opts, args = getopt.getopt(sys.argv[1:],
+        opts, args = getopt.getopt(sys.argv[1:] if argv is None else argv,
                                    'a:b:c:df:hj:k:lnp:r:t:',
                                    ['alpha=',
                                     'backend=',
+                                    'batch=',
+                                    'batch-lines=',
+                                    'bootstrap=',
                                     'by-name',
+                                    'cache=',
                                     'config=',
+                                    'connect=',
+                                    'decimate',
+                                    'density',
                                     'dry-run',
                                     'font=',
                                     'font-sz=',
                                     'no-grid',
                                     'help',
+                                    'jobs=',
                                     'join-key=',
                                     'key=',
                                     'latex',
                                     'lalpha=',
                                     'legend=',
                                     'lloc=',
+                                    'lmax=',
                                     'lncol=',
+                                    'mark-every=',
+                                    'merge-tol=',
                                     'only=',
                                     'plot-type=',
+                                    'portfolio=',
+                                    'portfolio-by=',
+                                    'portfolio-exact',
+                                    'rasterize',
                                     'replace=',
                                     'reverse',
                                     'save-to=',
+                                    'serve=',
                                     'shape=',
+                                    'stats=',
                                     'timeout=',
                                     'tlabel=',
                                     'tol-loc=',
@@ -83,8 +101,13 @@ def parse_options():
         def_path = os.path.join(os.path.dirname(os.path.realpath(__file__)), 'defaults.json')
 
     with open(def_path, 'r') as fp:
-        options = json.load(fp)['settings']
+        config = json.load(fp)
+
+        options = config['settings']
         options['def_path'] = def_path
+        options['cactus_linestyle'] = config['cactus_linestyle']
+        options['heatmap_style'] = config['heatmap_style']
+        options['scatter_style'] = config['scatter_style']
 
     # parsing command-line options
     for opt, arg in opts:
@@ -92,8 +115,22 @@ def parse_options():
             options['alpha'] = float(arg)
         elif opt in ('-b', '--backend'):
             options['backend'] = str(arg)
+        elif opt == '--batch':
+            options['batch'] = str(arg)
+        elif opt == '--batch-lines':
+            options['batch_lines'] = int(arg)
+        elif opt == '--bootstrap':
+            options['bootstrap'] = int(arg)
+        elif opt == '--cache':
+            options['cache_dir'] = str(arg)
         elif opt in ('-c', '--config'):
             pass  # already processed
+        elif opt == '--connect':
+            options['connect'] = str(arg)
+        elif opt == '--decimate':
+            options['decimate'] = True
+        elif opt == '--density':
+            options['density'] = True
         elif opt in ('-d', '--dry-run'):
             options['dry_run'] = True
         elif opt in ('-f', '--font'):
@@ -103,6 +140,8 @@ def parse_options():
         elif opt in ('-h', '--help'):
             usage()
             sys.exit(0)
+        elif opt == '--jobs':
+            options['jobs'] = int(arg)
         elif opt == '--no-grid':
             options['no_grid'] = True
         elif opt in ('-j', '--join-key'):
@@ -117,22 +156,40 @@ def parse_options():
             options['legend'] = [k.strip() for k in str(arg).split(',')]
         elif opt == '--lloc':
             options['lgd_loc'] = str(arg)
+        elif opt == '--lmax':
+            options['lgd_max'] = int(arg)
         elif opt == '--lncol':
             options['lgd_ncol'] = int(arg)
+        elif opt == '--mark-every':
+            options['mark_every'] = int(arg)
+        elif opt == '--merge-tol':
+            options['merge_tol'] = float(arg)
         elif opt in ('-n', '--by-name'):
             options['by_name'] = True
         elif opt == '--only':
             options['only'] = [t.strip() for t in str(arg).split(',')]
         elif opt in ('-p', '--plot-type'):
             options['plot_type'] = str(arg)
+        elif opt == '--portfolio':
+            options['portfolio'] = int(arg)
+        elif opt == '--portfolio-by':
+            options['portfolio_by'] = str(arg)
+        elif opt == '--portfolio-exact':
+            options['portfolio_exact'] = True
+        elif opt == '--rasterize':
+            options['rasterize'] = True
         elif opt in ('-r', '--replace'):
             options['repls'] = json.loads(str(arg))
         elif opt == '--reverse':
             options['reverse'] = True
         elif opt == '--save-to':
             options['save_to'] = str(arg)
+        elif opt == '--serve':
+            options['serve'] = str(arg)
         elif opt == '--shape':
             options['shape'] = str(arg)
+        elif opt == '--stats':
+            options['stats'] = str(arg)
         elif opt in ('-t', '--timeout'):
             options['timeout'] = float(arg)
         elif opt == '--tlabel':
@@ -164,9 +221,36 @@ def parse_options():
         else:
             assert False, 'Unhandled option: {0} {1}'.format(opt, arg)
 
+    try:
+        check_options(options)
+    except OptionsException as err:
+        sys.stderr.write(str(err) + '\n')
+        sys.exit(1)
+
     return options, args
 
 
+#
+#==============================================================================
+def check_options(options):
+    """
+        Normalizes the options given either on the command line or by a
+        job of a batch: the backend can be a comma-separated list. Raises
+        an exception if the options cannot be used together.
+    """
+
+    if type(options['backend']) is not list:
+        options['backend'] = [b.strip() for b in str(options['backend']).split(',')]
+
+    if options['plot_type'] not in ('cactus', 'pairwise', 'scatter'):
+        raise OptionsException('Unknown plot type: {0}'.format(options['plot_type']))
+
+    if 'pgfplots' in options['backend'] and options['plot_type'] != 'cactus':
+        raise OptionsException('pgfplots output is supported for cactus plots only')
+
+    return options
+
+
 #
 #==============================================================================
 def usage():
@@ -178,15 +262,27 @@ def usage():
     print('Options:')
     print('        -a, --alpha=<float>             Alpha value (only for scatter plots)')
     print('                                        Available values: [0 .. 1] (default = 0.3)')
-    print('        -b, --backend=<string>          Backend to use')
-    print('                                        Available values: pdf, pgf, png, ps, svg (default = pdf)')
+    print('        -b, --backend=<string-list>     Comma-separated list of backends to use (a file is saved for each of them)')
+    print('                                        Available values: pdf, pgf, pgfplots, png, ps, svg (default = pdf)')
+    print('        --batch=<string>                JSON file with a list of jobs, each overriding the settings of one plot')
+    print('                                        Format: [{"plot_type": "cactus", "save_to": "c"}, ...] (default = none)')
+    print('        --batch-lines=<int>             Number of cactus lines from which all of them are drawn as one collection')
+    print('                                        Available values: [1 .. INT_MAX] (default = 50)')
+    print('        --bootstrap=<int>               Number of resamples for confidence intervals of the statistics and bands of cactus lines')
+    print('                                        Available values: [1 .. INT_MAX] (default = none)')
+    print('        --cache=<string>                Directory to cache parsed STAT files in (default = none)')
     print('        -c, --config=<string>           Path to the default configuration file (default = $MKPLOT/defaults.json)')
+    print('        --connect=<string>              Send the command line to the daemon listening on this socket')
+    print('        --decimate                      Draw only the points of cactus lines that are visible at the figure size')
+    print('        --density                       Show the density of points instead of the points (for scatter plots only)')
     print('        -d, --dry-run                   Do not create a plot but instead show the tools sorted in the terminal')
     print('        -f, --font=<string>             Font to use')
     print('                                        Available values: cmr, helvetica, palatino, times (default = times)')
     print('        --font-sz=<int>                 Font size to use')
     print('                                        Available values: [0 .. INT_MAX] (default = 12)')
     print('        -h, --help                      Show this message')
+    print('        --jobs=<int>                    Number of processes used to read STAT files and to create the plots of a batch')
+    print('                                        Available values: [1 .. INT_MAX] (default = 1)')
     print('        --no-grid                       Do not show the grid')
     print('        -j, --join-key=<string-list>    Comma-separated list of keys to join all benchmarks per each tool')
     print('        -k, --key=<string>              Key to measure')
@@ -198,20 +294,35 @@ def usage():
     print('                                        Format: "program,prog_args" (default = program)')
     print('        --lloc=<string>                 Legend location')
     print('                                        Available values: upper/center/lower left/right, center, best, off (default = upper left)')
+    print('        --lmax=<int>                    Maximal number of tools in the legend (the others are summarised in one entry)')
+    print('                                        Available values: [1 .. INT_MAX] (default = none or, from --batch-lines tools, 10)')
     print('        --lncol=<int>                   Number of columns in the legend')
     print('                                        Available values: [1 .. INT_MAX] (default = 1)')
+    print('        --mark-every=<int>              Put markers on every k-th point of cactus lines')
+    print('                                        Available values: [1 .. INT_MAX] (default = 1 or, with --decimate, evenly spaced)')
+    print('        --merge-tol=<float>             Merge the points of a scatter plot that are closer than this (in decades)')
+    print('                                        Available values: [0 .. INT_MAX], 0 merges equal points only (default = none)')
     print('        -n, --by-name                   Assign line style to tools by their name')
     print('        --only=<string-list>            Comma-separated list of names')
     print('                                        Format: "tool1,tool2" (default = none)')
     print('        -p, --plot-type=<string>        Plot type to produce')
-    print('                                        Available values: cactus or scatter (default = cactus)')
+    print('                                        Available values: cactus, pairwise or scatter (default = cactus)')
+    print('        --portfolio=<int>               Print the portfolio of this many tools whose VBS is the best (in the format of --vbs)')
+    print('                                        Available values: [1 .. INT_MAX] (default = none)')
+    print('        --portfolio-by=<string>         Quality of the VBS of a portfolio')
+    print('                                        Available values: par2, solved (default = solved)')
+    print('        --portfolio-exact               Find the best portfolio by branch and bound instead of greedily (for small portfolios)')
+    print('        --rasterize                     Rasterize the points while keeping the rest of the plot vector (for scatter plots only)')
     print('        -r, --replace=<json-string>     List of name replacements')
     print('                                        Format: {"name1": "$nice_name1$", "name2": "$nice_name2$"} (default = none)')
     print('        --reverse                       Use reversed sorting')
     print('        --save-to=<string>              Where result figure should be saved')
     print('                                        Default value: plot')
+    print('        --serve=<string>                Run as a daemon creating plots requested over this socket')
     print('        --shape=<string>                Shape of the plot')
     print('                                        Available values: long, squared, standard (default = standard)')
+    print('        --stats=<string>                Format of the statistics shown by a dry run (by default, only solved, min., max. and avg. values)')
+    print('                                        Available values: csv, json, tex, text (default = none)')
     print('        -t, --timeout=<int>             Timeout value')
     print('                                        Available values: [0 .. INT_MAX] (default = 3600)')
     print('        --tlabel=<string>               Timeout label (for scatter plots only)')
@@ -235,29 +346,232 @@ def usage():
     print('                                        Available values: [0 .. INT_MAX] (default = 0)')
 
 
+#
+#==============================================================================
+def make_plots(files, options, reader=None):
+    """
+        Creates the plots requested by the options (either a single plot
+        or a batch). The input files are read by the given function, by
+        default read_data(). Returns the list of files created.
+    """
+
+    # data modules are imported only if data is loaded
+    from load import read_data
+
+    if reader is None:
+        reader = read_data
+
+    if options['batch']:
+        return make_batch(files, options, reader)
+    elif options['portfolio']:
+        return show_portfolio(reader(files, options), options)
+    elif options['dry_run']:
+        return show_stats(reader(files, options), options)
+    else:
+        return make_plot(load_plot(reader(files, options), options), options)
+
+
+#
+#==============================================================================
+def load_plot(matrix, options):
+    """
+        Loads the data of a plot: the data of each tool or, for pairwise
+        plots, the comparison of all the pairs of tools.
+    """
+
+    if options['plot_type'] == 'pairwise':
+        from load import load_columns
+        from pairwise import compare
+
+        return compare(*load_columns(matrix, options), options=options)
+    else:
+        from load import load_matrix
+
+        return load_matrix(matrix, options)
+
+
+#
+#==============================================================================
+def show_stats(matrix, options):
+    """
+        Shows the statistics of the data (or, for pairwise plots, of the
+        pairs of tools) in the terminal instead of creating a plot in
+        the format requested. No files are created.
+    """
+
+    if options['plot_type'] == 'pairwise':
+        from pairwise import write_pairs
+
+        write_pairs(load_plot(matrix, options), options['stats'] or 'text', sys.stdout)
+    else:
+        from load import load_columns
+        from summary import summarize, write_stats
+
+        write_stats(summarize(*load_columns(matrix, options), options=options),
+                options['stats'], sys.stdout)
+
+    return []
+
+
+#
+#==============================================================================
+def show_portfolio(matrix, options):
+    """
+        Prints the portfolio of tools selected in the format of --vbs
+        (its quality is reported on the standard error). No files are
+        created.
+    """
+
+    from load import load_columns
+    from portfolio import make_portfolio
+
+    tools, solved, par2 = make_portfolio(*load_columns(matrix, dict(options, vbs=None)), options=options)
+
+    print(json.dumps({'portfolio': tools}))
+    print('portfolio of {0} tools: {1} solved, PAR2 {2:.1f}'.format(len(tools), solved, par2),
+            file=sys.stderr)
+
+    return []
+
+
+#
+#==============================================================================
+def make_plot(data, options):
+    """
+        Creates a plot of the data. Returns the list of files created.
+    """
+
+    # plotting modules are imported only if a plot is created
+    import matplotlib
+    matplotlib.use('pdf')  # for not loading GUI modules
+
+    if options['plot_type'] == 'cactus':
+        from cactus import Cactus
+        plotter = Cactus(options)
+    elif options['plot_type'] == 'pairwise':
+        from heatmap import Heatmap
+        plotter = Heatmap(options)
+    else:
+        from scatter import Scatter
+        plotter = Scatter(options)
+
+    plotter.create(data)
+
+    return plotter.save_to
+
+
+#
+#==============================================================================
+def make_batch(files, options, reader):
+    """
+        Creates all the plots of a batch. The input files are read once
+        (keeping all the keys measured by the jobs) and each job loads
+        the data with its own settings. Plots are then created by a pool
+        of processes if more than one job is requested. Returns the list
+        of files created.
+    """
+
+    with open(options['batch'], 'r') as fp:
+        jobs = [dict(options, **job) for job in json.load(fp)]
+
+    for i, job in enumerate(jobs):
+        try:
+            check_options(job)
+        except OptionsException as err:
+            sys.stderr.write('Job {0} of \'{1}\': {2}\n'.format(i + 1, options['batch'], err))
+            sys.exit(1)
+
+    keys = []
+    for job in jobs:
+        if job['key'] not in keys:
+            keys.append(job['key'])
+
+    matrix = reader(files, options, keys=keys)
+
+    # dry runs only print the data, thus they are done first and in order
+    for job in jobs:
+        if job['portfolio']:
+            show_portfolio(matrix, job)
+        elif job['dry_run']:
+            show_stats(matrix, job)
+
+    batch = [(load_plot(matrix, job), job) for job in jobs if not job['dry_run'] and not job['portfolio']]
+    figs = range(len(batch))
+
+    procs = min(options['jobs'], len(figs))
+    if procs > 1:
+        # with fork, the workers share the data of the parent process
+        # instead of receiving a pickled copy for each plot (a shared
+        # memory block would need Python 3.8 and a copy of the data)
+        pool = multiprocessing.Pool(procs, initializer=share_batch,
+                initargs=(batch,))
+        try:
+            created = pool.map(render, figs, chunksize=1)
+        finally:
+            pool.close()
+            pool.join()
+    else:
+        share_batch(batch)
+        created = [render(i) for i in figs]
+
+    return sum(created, [])
+
+
+#
+#==============================================================================
+shared_batch = []
+
+
+#
+#==============================================================================
+def share_batch(batch):
+    """
+        Makes the loaded data of a batch available to render().
+    """
+
+    global shared_batch
+    shared_batch = batch
+
+
+#
+#==============================================================================
+def render(i):
+    """
+        Creates the i-th plot of the shared batch.
+    """
+
+    data, options = shared_batch[i]
+    return make_plot(data, options)
+
+
 #
 #==============================================================================
 if __name__ == '__main__':
     options, fns = parse_options()
 
-    if not fns:
-        pass  # error handling
+    if options['connect']:
+        from daemon import request
+
+        reply = request(options['connect'], sys.argv[1:])[0]
+        sys.stdout.write(reply['output'])
+        if reply['error']:
+            sys.stderr.write(reply['error'] + '\n')
 
-    data = load_data(fns, options)
+        sys.exit(reply['status'])
+    elif options['serve']:
+        from daemon import Daemon
 
-    if options['dry_run']:
-        for d in data:
-            d1 = list(map(lambda x: min(x, options['timeout']), d[1]))
+        daemon = Daemon(options['serve'], cache_size=options['daemon_cache'])
+        signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
 
-            print('{0}:'.format(d[0]))
-            print('    # solved: {0}'.format(d[2]))
-            print('    min. val: {0:.1f}'.format(float(min(d1))))
-            print('    max. val: {0:.1f}'.format(float(max(d1))))
-            print('    avg. val: {0:.1f}'.format(float(sum(d1)) / len(d1)))
+        try:
+            daemon.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            daemon.server_close()
     else:
-        if options['plot_type'] == 'cactus':
-            plotter = Cactus(options)
-        else:
-            plotter = Scatter(options)
+        if not fns:
+            pass  # error handling
 
-        plotter.create(data)
+        make_plots(fns, options)
@@ -0,0 +1,149 @@
+#!/usr/bin/env python
+#-*- coding:utf-8 -*-
+##
+## pack.py
+##
+##  Created on: Oct 17, 2026
+##
+
+#
+#==============================================================================
+import json
+import numpy as np
+import struct
+from statutil import StatArray, StatMatrix
+
+
+#
+#==============================================================================
+PACK_MAGIC = b'MKPLOTPK'
+PACK_VERSION = 1
+PACK_ALIGN = 64
+
+
+#
+#==============================================================================
+class PackException(Exception):
+    pass
+
+
+#
+#==============================================================================
+def is_pack(filename):
+    """
+        Checks whether a file is a results pack.
+    """
+
+    with open(filename, 'rb') as fp:
+        return fp.read(len(PACK_MAGIC)) == PACK_MAGIC
+
+
+#
+#==============================================================================
+class ResultsPack(StatMatrix, object):
+    """
+        A StatMatrix stored in a file holding a whole campaign: the
+        status, the presence and the values of every metric for all
+        solvers and instances.
+
+        The file layout is: magic, version and header size, a JSON header
+        (solver preambles, metric names and array offsets), and then the
+        arrays aligned to 64 bytes: the newline-separated instance name
+        table, the status and presence bitmaps, and one matrix per
+        metric (NaN marks a missing value). Matrices are solver-major, so
+        that the data of one solver is contiguous on disk.
+    """
+
+    @classmethod
+    def from_matrix(cls, matrix):
+        """
+            Creates a pack from a StatMatrix object (e.g. the core of a
+            StatArray object).
+        """
+
+        return cls(matrix.insts, matrix.preambles, matrix.status,
+                matrix.present, matrix.metrics)
+
+    @classmethod
+    def read(cls, filename):
+        """
+            Opens a pack file. The metric matrices are memory-mapped.
+        """
+
+        with open(filename, 'rb') as fp:
+            magic, version, hsize = struct.unpack('<8sII', fp.read(16))
+            if magic != PACK_MAGIC:
+                raise PackException('\'{0}\' is not a results pack.'.format(filename))
+            if version != PACK_VERSION:
+                raise PackException('Unsupported pack version {0} in \'{1}\'.'.format(version, filename))
+
+            header = json.loads(fp.read(hsize).decode('utf-8'))
+
+        buf = np.memmap(filename, dtype=np.uint8, mode='r')
+        arrays = {}
+        for name, (offset, dtype, shape) in header['arrays'].items():
+            size = int(np.prod(shape)) * np.dtype(dtype).itemsize
+            arrays[name] = buf[offset:offset + size].view(dtype).reshape(shape)
+
+        names = arrays['insts'].tobytes().decode('utf-8')
+        insts = names.split('\n') if header['size'] else []
+
+        shape = (len(header['preambles']), header['size'])
+        status = np.unpackbits(arrays['status'], axis=1, count=shape[1]).astype(bool).reshape(shape)
+        present = np.unpackbits(arrays['present'], axis=1, count=shape[1]).astype(bool).reshape(shape)
+        metrics = {k: arrays['metric{0}'.format(i)] for i, k in enumerate(header['metrics'])}
+
+        return cls(insts, header['preambles'], status, present, metrics)
+
+    def write(self, filename):
+        """
+            Saves the pack to a file.
+        """
+
+        arrays = [('insts', np.frombuffer('\n'.join(self.insts).encode('utf-8'), dtype=np.uint8)),
+                ('status', np.packbits(self.status, axis=1)),
+                ('present', np.packbits(self.present, axis=1))]
+        metric_names = sorted(self.metrics.keys())
+        for i, k in enumerate(metric_names):
+            arrays.append(('metric{0}'.format(i), np.ascontiguousarray(self.metrics[k])))
+
+        # offsets depend on the header size, which depends on offsets;
+        # thus, reserving enough space for the header first
+        header = {'size': len(self.insts), 'preambles': self.preambles,
+                'metrics': metric_names, 'arrays': {}}
+        for name, arr in arrays:
+            header['arrays'][name] = [0, arr.dtype.str, list(arr.shape)]
+
+        hsize = len(json.dumps(header).encode('utf-8')) + 32 * len(arrays)
+        offset = align(16 + hsize)
+        for name, arr in arrays:
+            header['arrays'][name][0] = offset
+            offset = align(offset + arr.nbytes)
+
+        hdata = json.dumps(header).encode('utf-8')
+        hdata += b' ' * (hsize - len(hdata))
+
+        with open(filename, 'wb') as fp:
+            fp.write(struct.pack('<8sII', PACK_MAGIC, PACK_VERSION, hsize))
+            fp.write(hdata)
+
+            for name, arr in arrays:
+                fp.write(b'\0' * (header['arrays'][name][0] - fp.tell()))
+                fp.write(arr.tobytes())
+
+    def to_stats(self):
+        """
+            Creates a StatArray object of views of the pack.
+        """
+
+        return StatArray.from_matrix(self)
+
+
+#
+#==============================================================================
+def align(offset):
+    """
+        Rounds an offset up to the alignment of arrays in a pack.
+    """
+
+    return (offset + PACK_ALIGN - 1) // PACK_ALIGN * PACK_ALIGN
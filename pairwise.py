@@ -0,0 +1,130 @@
+#!/usr/bin/env python
+#-*- coding:utf-8 -*-
+##
+## pairwise.py
+##
+##  Created on: Oct 17, 2026
+##
+
+#
+#==============================================================================
+import collections
+import csv
+import json
+from load import value_bounds
+import numpy as np
+from util import tex_escape
+
+
+#
+#==============================================================================
+def compare(labels, values, solved, present, insts, options):
+    """
+        Compares all the pairs of tools given the matrices made by
+        load_columns(). For tools a and b, entry [a][b] of the result
+        counts the instances a wins against b (i.e. solves while b does
+        not or solves faster), the instances a solves while b does not
+        (b times out), the instances both solve and the geometric mean
+        of the speed-up of a over b on the latter. Only the instances
+        run by both tools are taken into account. Tools are filtered,
+        renamed and ranked as in the plots.
+    """
+
+    min_val, timeout, max_value = value_bounds(options)
+
+    rows = [j for j, label in enumerate(labels) if not options['only'] or label in options['only']]
+    if options['repls']:
+        labels = [options['repls'].get(label, label) for label in labels]
+
+    n = len(rows)
+    shape = (n, n)
+    wins, only, both, logs = np.zeros(shape), np.zeros(shape), np.zeros(shape), np.zeros(shape)
+    nsolved, npresent, total = np.zeros(n), np.zeros(n), np.zeros(n)
+
+    # instances are processed in chunks so that the pairwise comparison
+    # of their values (a cube of tools by tools by instances) is small
+    step = max(1, (1 << 24) // max(1, n * n))
+    for lo in range(0, values.shape[1], step):
+        cols = slice(lo, lo + step)
+
+        p = present[rows, cols]
+        s = solved[rows, cols] & p
+        v = np.clip(values[rows, cols], min_val, timeout)
+        v[~s | np.isnan(v)] = timeout
+
+        sf = s.astype(np.float64)
+        both += np.dot(sf, sf.T)
+        only += np.dot(sf, (p & ~s).T)
+        logs += np.dot(np.where(s, np.log(v), 0), sf.T)
+
+        # a wins against b if its value is below the value of b, which
+        # is infinite if b does not solve the instance and is negative
+        # infinity if b does not run it (neither can then win)
+        left = np.where(s, v, np.inf)
+        right = np.where(p, left, -np.inf)
+        wins += np.count_nonzero(left[:, None] < right[None], axis=2)
+
+        nsolved += sf.sum(axis=1)
+        npresent += p.sum(axis=1)
+        total += (v * sf).sum(axis=1)
+
+    # speed-up of a over b is the geometric mean of b's values over a's
+    with np.errstate(invalid='ignore', divide='ignore'):
+        speedup = np.where(both > 0, np.exp((logs.T - logs) / both), np.nan)
+
+    # the ranking of select()
+    total += (npresent - nsolved) * max_value
+    order = sorted(range(n), key=lambda i: nsolved[i] + (npresent[i] / total[i] if total[i] else 0),
+            reverse=not options['reverse'])
+
+    matrix = lambda m, conv: [[conv(m[a, b]) for b in order] for a in order]
+
+    result = collections.OrderedDict()
+    result['tools'] = [labels[rows[i]] for i in order]
+    result['solved'] = [int(nsolved[i]) for i in order]
+    result['wins'] = matrix(wins, int)
+    result['timeouts'] = matrix(only, int)
+    result['common'] = matrix(both, int)
+    result['speedup'] = matrix(speedup, lambda x: None if np.isnan(x) else float(x))
+
+    return result
+
+
+#
+#==============================================================================
+def write_pairs(pairs, fmt, fp):
+    """
+        Writes the result of compare() in one of the formats: text, json,
+        csv (a row per pair of tools) or tex (the matrix of wins).
+    """
+
+    tools = pairs['tools']
+    others = lambda a: [b for b in range(len(tools)) if b != a]
+
+    if fmt == 'json':
+        json.dump(pairs, fp, indent=4)
+        fp.write('\n')
+    elif fmt == 'csv':
+        writer = csv.writer(fp, lineterminator='\n')
+        writer.writerow(['tool', 'other', 'wins', 'losses', 'timeouts', 'common', 'speedup'])
+        for a in range(len(tools)):
+            for b in others(a):
+                writer.writerow([tools[a], tools[b], pairs['wins'][a][b], pairs['wins'][b][a],
+                    pairs['timeouts'][a][b], pairs['common'][a][b],
+                    pairs['speedup'][a][b] if pairs['speedup'][a][b] is not None else ''])
+    elif fmt == 'tex':
+        fp.write('\\begin{{tabular}}{{l{0}}}\n\\hline\n'.format('r' * len(tools)))
+        fp.write(' & '.join(['Wins'] + [tex_escape(t) for t in tools]) + ' \\\\\n\\hline\n')
+        for a in range(len(tools)):
+            fp.write(' & '.join([tex_escape(tools[a])] + [str(pairs['wins'][a][b])
+                if b != a else '--' for b in range(len(tools))]) + ' \\\\\n')
+        fp.write('\\hline\n\\end{tabular}\n')
+    else:
+        for a in range(len(tools)):
+            print('{0}:'.format(tools[a]), file=fp)
+            for b in others(a):
+                speedup = pairs['speedup'][a][b]
+                print('    vs {0}: {1} wins, {2} losses, {3} timeouts of the other, speed-up {4} ({5} common)'.format(
+                    tools[b], pairs['wins'][a][b], pairs['wins'][b][a], pairs['timeouts'][a][b],
+                    '{0:.2f}'.format(speedup) if speedup is not None else 'n/a',
+                    pairs['common'][a][b]), file=fp)
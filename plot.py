@@ -10,16 +10,28 @@
 
 #
 #==============================================================================
+import contextlib
+from matplotlib.figure import Figure
 import matplotlib.pyplot as plt
 import numpy as np
 import os
+import threading
+
+
+#
+#==============================================================================
+# matplotlib settings are global, thus plots are created one at a time
+settings_lock = threading.RLock()
 
 
 #
 #==============================================================================
 class Plot():
     """
-        Basic plotting class.
+        Basic plotting class. Each plot draws on its own figure and
+        applies its settings to matplotlib only while being created (see
+        context()), which makes it possible to create several plots in
+        one process.
     """
 
     def __init__(self, options):
@@ -28,7 +40,7 @@ class Plot():
         """
 
         self.alpha       = options['alpha']
-        self.backend     = options['backend']
+        self.backends    = options['backend']
         self.save_to     = options['save_to']
         self.def_path    = options['def_path']
         self.transparent = options['transparent']
@@ -58,8 +70,9 @@ class Plot():
         self.grid_width = options['grid_width']
         self.byname     = options['by_name']
 
-        # where to save
-        self.save_to = '{0}.{1}'.format(os.path.splitext(self.save_to)[0], self.backend)
+        # where to save (a file per backend)
+        self.save_to = ['{0}.{1}'.format(os.path.splitext(self.save_to)[0],
+            b if b != 'pgfplots' else 'tex') for b in self.backends]
 
         # font properties
         self.f_props = {'serif': ['Times'], 'sans-serif': ['Helvetica'],
@@ -76,13 +89,10 @@ class Plot():
             self.f_props['family'] = 'serif'
             self.f_props['serif'] = 'Palatino'
 
-        plt.rc('text', usetex=options['usetex'])
-        plt.rc('font', **self.f_props)
-        plt.rc('text.latex', preamble=r'\usepackage{amsmath}')
-        plt.rcParams["text.latex.preamble"].join([
-            r"\usepackage{amsmath}",
-            r'\mathchardef\mhyphen="2D'
-        ])
+        # matplotlib settings of the plot
+        self.params = {'text.usetex': options['usetex'],
+                'text.latex.preamble': r'\usepackage{amsmath}'}
+        self.params.update({'font.' + k: v for k, v in self.f_props.items()})
 
         # figure properties
         nof_subplots = 1
@@ -97,24 +107,52 @@ class Plot():
             coeff = options['shape'][4:]
             fig_width *= 1.2 if not coeff else float(coeff)  # default coefficient is 1.2
 
-        fig_size = [fig_width * 2.5, fig_height * 2.5]
+        self.params['figure.figsize'] = [fig_width * 2.5, fig_height * 2.5]
 
-        params = {'backend': 'pdf', 'text.usetex': options['usetex'], 'figure.figsize': fig_size}
+        # the backend is chosen by savefig() from the file extension
+        if 'pgf' in self.backends:  # PGF/TikZ
+            self.params.update({'pgf.texsystem': 'pdflatex',
+                'pgf.preamble': r'\usepackage[utf8x]{inputenc} \usepackage[T1]{fontenc}'})
 
-        plt.rcParams.update(params)
+        # funny mode
+        self.xkcd = options['xkcd']
 
-        # choosing backend
-        if self.backend in ('pdf', 'ps', 'svg'):  # default is pdf
-            plt.switch_backend(self.backend)
-        elif self.backend == 'pgf':  # PGF/TikZ
-            pgf_params = {'pgf.texsystem': 'pdflatex',
-                          'pgf.preamble': r'\usepackage[utf8x]{inputenc} \usepackage[T1]{fontenc}'}
-            params.update(pgf_params)
-            plt.rcParams.update(params)
-            plt.switch_backend(self.backend)
-        elif self.backend == 'png':
-            plt.switch_backend('agg')
+    @contextlib.contextmanager
+    def context(self):
+        """
+            Applies the settings of the plot within a context. Global
+            matplotlib settings are restored on exit. Contexts of plots
+            created in different threads do not overlap.
+        """
 
-        # funny mode
-        if options['xkcd']:
-            plt.xkcd()
+        with settings_lock, plt.rc_context(self.params):
+            if self.xkcd:
+                plt.xkcd()  # changes the settings of this context only
+
+            yield
+
+    def figure(self):
+        """
+            Creates a new figure with a single pair of axes. The figure
+            is not registered in pyplot, i.e. it does not become the
+            current figure.
+        """
+
+        fig = Figure()
+        return fig, fig.add_subplot(111)
+
+    def save(self, fig):
+        """
+            Saves a figure in the format of each backend and then closes
+            it. The figure is built once; only its rendering is repeated
+            for each format. Only cactus plots can be saved as pgfplots
+            pictures (see check_options()).
+        """
+
+        for b, f in zip(self.backends, self.save_to):
+            if b == 'pgfplots':
+                self.save_pgfplots(fig, f)
+            else:
+                fig.savefig(f, bbox_inches='tight', transparent=self.transparent)
+
+        fig.clear()
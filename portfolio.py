@@ -0,0 +1,187 @@
+#!/usr/bin/env python
+#-*- coding:utf-8 -*-
+##
+## portfolio.py
+##
+##  Created on: Oct 17, 2026
+##
+
+#
+#==============================================================================
+from load import value_bounds
+import numpy as np
+
+
+#
+#==============================================================================
+# number of bits set in every byte
+bit_counts = np.array([bin(b).count('1') for b in range(256)], dtype=np.uint8)
+
+
+#
+#==============================================================================
+class Objective:
+    """
+        Quality of the VBS of a portfolio, to be maximized. The state of
+        a portfolio is either the bitmap of the instances solved by its
+        VBS (if the number of solved instances is maximized) or the
+        penalized values of its VBS (if the PAR2 score is minimized).
+        Operations are vectorized over portfolios, i.e. over the rows
+        of a matrix of states.
+    """
+
+    def __init__(self, solved, values, by):
+        """
+            Constructor.
+        """
+
+        self.by = by
+
+        if by == 'solved':
+            self.states = np.packbits(solved, axis=1)
+            self.empty = np.zeros(self.states.shape[1], dtype=np.uint8)
+        else:
+            self.states = values
+            self.empty = np.full(values.shape[1], np.inf)
+
+    def merge(self, state, other):
+        """
+            State of the union of two portfolios.
+        """
+
+        if self.by == 'solved':
+            return np.bitwise_or(state, other)
+        else:
+            return np.minimum(state, other)
+
+    def union(self, rows):
+        """
+            State of the portfolio of the given tools.
+        """
+
+        state = self.empty
+        for i in rows:
+            state = self.merge(state, self.states[i])
+
+        return state
+
+    def score(self, states):
+        """
+            Quality of each state.
+        """
+
+        if self.by == 'solved':
+            return bit_counts[states].sum(axis=-1, dtype=np.int64)
+        else:
+            return -states.mean(axis=-1)
+
+    def bound(self, state, rest, union, nof_tools):
+        """
+            Upper bound on the quality of a portfolio extended with at
+            most the given number of the remaining tools (whose union is
+            given). Adding all of them is at least as good; the number of
+            solved instances cannot also grow more than by the largest
+            gains of single tools.
+        """
+
+        best = self.score(self.merge(state, union))
+
+        if self.by == 'solved':
+            gains = np.sort(self.score(self.merge(state, self.states[rest])))[::-1]
+            best = min(best, self.score(state) + (gains[:nof_tools] - self.score(state)).sum())
+
+        return best
+
+
+#
+#==============================================================================
+def make_portfolio(labels, values, solved, present, insts, options):
+    """
+        Selects the tools of a portfolio of the requested size given the
+        matrices made by load_columns(). The VBS of the portfolio either
+        solves the most instances or has the lowest PAR2 score (missing
+        instances are unsolved). Tools are added greedily one by one or,
+        if requested, the best portfolio is found by branch and bound.
+        Returns the labels of the tools chosen, the number of instances
+        solved by their VBS and its PAR2 score.
+    """
+
+    min_val, timeout, max_value = value_bounds(options)
+
+    rows = [j for j, label in enumerate(labels) if not options['only'] or label in options['only']]
+
+    s = solved[rows] & present[rows]
+    v = np.clip(values[rows], min_val, timeout)
+    v[~s | np.isnan(v)] = 2 * timeout
+
+    objective = Objective(s, v, options['portfolio_by'])
+    size = min(options['portfolio'], len(rows))
+
+    chosen = greedy(objective, size)
+    if options['portfolio_exact']:
+        chosen = branch_and_bound(objective, size, chosen)
+
+    best = v[chosen].min(axis=0) if chosen else np.full(v.shape[1], 2 * timeout)
+
+    return [labels[rows[i]] for i in chosen], int(s[chosen].any(axis=0).sum()), \
+            float(best.mean()) if len(best) else 0.0
+
+
+#
+#==============================================================================
+def greedy(objective, size):
+    """
+        Adds to the portfolio the tool improving it the most, until it
+        has the requested size.
+    """
+
+    chosen, state = [], objective.empty
+    rest = list(range(len(objective.states)))
+
+    while len(chosen) < size:
+        i = int(np.argmax(objective.score(objective.merge(state, objective.states[rest]))))
+
+        chosen.append(rest.pop(i))
+        state = objective.merge(state, objective.states[chosen[-1]])
+
+    return chosen
+
+
+#
+#==============================================================================
+def branch_and_bound(objective, size, initial):
+    """
+        Finds the best portfolio of the requested size. The tools are
+        tried from the best one alone, and branches that cannot improve
+        the best portfolio found so far (initially, the given one) are
+        pruned (see Objective.bound()).
+    """
+
+    order = np.argsort(-objective.score(objective.states), kind='stable')
+
+    # states of the unions of the last tools in the order
+    unions = [objective.empty] * (len(order) + 1)
+    for i in range(len(order) - 1, -1, -1):
+        unions[i] = objective.merge(unions[i + 1], objective.states[order[i]])
+
+    best = [objective.score(objective.union(initial)), list(initial)]
+
+    def search(start, chosen, state):
+        if len(chosen) == size:
+            score = objective.score(state)
+            if score > best[0]:
+                best[:] = [score, list(chosen)]
+            return
+
+        left = size - len(chosen)
+        if objective.bound(state, order[start:], unions[start], left) <= best[0]:
+            return
+
+        for i in range(start, len(order) - left + 1):
+            chosen.append(order[i])
+            search(i + 1, chosen, objective.merge(state, objective.states[order[i]]))
+            chosen.pop()
+
+    search(0, [], objective.empty)
+
+    return [int(i) for i in best[1]]
@@ -10,14 +10,11 @@
 
 #
 #==============================================================================
-import json
 import math
 import matplotlib.pyplot as plt
 from matplotlib import __version__ as mpl_version
 import numpy as np
 from plot import Plot
-import six
-from six.moves import range
 
 
 #
@@ -40,6 +37,10 @@ class Scatter(Plot, object):
 
         super(Scatter, self).__init__(options)
 
+        self.density   = options['density']
+        self.merge_tol = options['merge_tol']
+        self.rasterize = options['rasterize']
+
         # setting up axes limits
         if not self.x_min:
             self.x_min = self.y_min  # self.y_min is supposed to have a default value
@@ -64,8 +65,7 @@ class Scatter(Plot, object):
         if not self.t_label:
             self.t_label = '{0} sec. timeout'.format(int(self.timeout))
 
-        with open(self.def_path, 'r') as fp:
-            self.marker_style = json.load(fp)['scatter_style']
+        self.marker_style = options['scatter_style']
 
     def create(self, data):
         """
@@ -75,67 +75,99 @@ class Scatter(Plot, object):
         if len(data[0][1]) != len(data[1][1]):
             raise ScatterException('Number of instances for each competitor must be the same')
 
+        with self.context():
+            fig, ax = self.figure()
+            self.draw(ax, data)
+            self.save(fig)
+
+    def draw(self, ax, data):
+        """
+            Draws the points of the two tools on the given axes.
+        """
+
         step = math.ceil((self.x_max - self.x_min) / 10)
         x = np.arange(self.x_min, self.x_max + self.x_min + step, step)
 
         # "good" area
-        plt.plot(x, x, color='black', ls=':', lw=1.5, zorder=3)
-        plt.plot(x, 0.1 * x, 'g:', lw=1.5, zorder=3)
-        plt.plot(x, 10 * x, 'g:', lw=1.5, zorder=3)
-        plt.fill_between(x, 0.1 * x, 10 * x, facecolor='green', alpha=0.15,
+        ax.plot(x, x, color='black', ls=':', lw=1.5, zorder=3)
+        ax.plot(x, 0.1 * x, 'g:', lw=1.5, zorder=3)
+        ax.plot(x, 10 * x, 'g:', lw=1.5, zorder=3)
+        ax.fill_between(x, 0.1 * x, 10 * x, facecolor='green', alpha=0.15,
             zorder=3)
 
-        plt.xlim([self.x_min, self.x_max])
-        plt.ylim([self.y_min, self.y_max])
+        ax.set_xlim([self.x_min, self.x_max])
+        ax.set_ylim([self.y_min, self.y_max])
 
         # timeout lines
         if self.tlb_loc != 'none':
-            plt.axvline(self.timeout, linewidth=1, color='red', ls=':',
+            ax.axvline(self.timeout, linewidth=1, color='red', ls=':',
                 label=str(self.timeout), zorder=3)
-            plt.axhline(self.timeout, linewidth=1, color='red', ls=':',
+            ax.axhline(self.timeout, linewidth=1, color='red', ls=':',
                 label=str(self.timeout), zorder=3)
 
             if self.tlb_loc == 'after':
-                plt.text(2 * self.x_min, self.timeout + self.x_max / 40,
+                ax.text(2 * self.x_min, self.timeout + self.x_max / 40,
                     self.t_label, horizontalalignment='left',
                     verticalalignment='bottom', fontsize=self.f_props['size'] * 0.8)
-                plt.text(self.timeout + self.x_max / 40, 2 * self.x_min,
+                ax.text(self.timeout + self.x_max / 40, 2 * self.x_min,
                     self.t_label, horizontalalignment='left',
                     verticalalignment='bottom', fontsize=self.f_props['size'] * 0.8,
                     rotation=90)
             else:
-                plt.text(2 * self.x_min, self.timeout - self.x_max / 3.5,
+                ax.text(2 * self.x_min, self.timeout - self.x_max / 3.5,
                     self.t_label, horizontalalignment='left',
                     verticalalignment='bottom', fontsize=self.f_props['size'] * 0.8)
-                plt.text(self.timeout - self.x_max / 3.5, 2 * self.x_min,
+                ax.text(self.timeout - self.x_max / 3.5, 2 * self.x_min,
                     self.t_label, horizontalalignment='left',
                     verticalalignment='bottom', fontsize=self.f_props['size'] * 0.8,
                     rotation=90)
 
         # scatter
-        plt.scatter(data[0][1], data[1][1], c=self.marker_style['color'],
-            marker=self.marker_style['marker'],
-            edgecolors=self.marker_style['edgecolor'],
-            s=self.marker_style['size'],
-            alpha=self.alpha, zorder=5)
+        if self.density:
+            # log-binned density drawn below the lines
+            hb = ax.hexbin(data[0][1], data[1][1], xscale='log', yscale='log',
+                extent=np.log10([self.x_min, self.x_max, self.y_min, self.y_max]),
+                gridsize=self.marker_style['gridsize'], bins='log', mincnt=1,
+                cmap=self.marker_style['cmap'], edgecolors='face',
+                rasterized=self.rasterize, zorder=2)
+            ax.figure.colorbar(hb, ax=ax).set_label('instances')
+        elif self.merge_tol is not None:
+            xs, ys, counts = merge_points(data[0][1], data[1][1], self.merge_tol)
+
+            # points merged from up to 2^(l + 1) - 1 points are drawn as
+            # if 2^l points were drawn, and their size grows with l
+            levels = np.log2(counts).astype(int)
+            for l in np.unique(levels):
+                ax.scatter(xs[levels == l], ys[levels == l],
+                    c=self.marker_style['color'],
+                    marker=self.marker_style['marker'],
+                    edgecolors=self.marker_style['edgecolor'],
+                    s=self.marker_style['size'] * (1 + l * math.log10(2)),
+                    alpha=1 - (1.0 - self.alpha) ** (2 ** l),
+                    rasterized=self.rasterize, zorder=5)
+        else:
+            ax.scatter(data[0][1], data[1][1], c=self.marker_style['color'],
+                marker=self.marker_style['marker'],
+                edgecolors=self.marker_style['edgecolor'],
+                s=self.marker_style['size'],
+                alpha=self.alpha, rasterized=self.rasterize, zorder=5)
 
         # axes' labels
         if self.x_label:
-            plt.xlabel(self.x_label)
+            ax.set_xlabel(self.x_label)
         else:
-            plt.xlabel(data[0][0])
+            ax.set_xlabel(data[0][0])
 
         if self.y_label:
-            plt.ylabel(self.y_label)
+            ax.set_ylabel(self.y_label)
         else:
-            plt.ylabel(data[1][0])
+            ax.set_ylabel(data[1][0])
 
         # turning the grid on
         if not self.no_grid:
-            plt.grid(True, color='black', ls=':', lw=1, zorder=1)
+            ax.grid(True, color='black', ls=':', lw=1, zorder=1)
 
         # choosing logarithmic scales
-        ax = plt.gca()
         ax.set_xscale('log')
         ax.set_yscale('log')
 
@@ -151,136 +183,31 @@ class Scatter(Plot, object):
         ax.yaxis.set_major_formatter(majorFormatter)
 
         # setting frame thickness
-        for i in six.itervalues(ax.spines):
+        for i in ax.spines.values():
             i.set_linewidth(1)
 
-        plt.savefig(self.save_to, bbox_inches='tight', transparent=self.transparent)
-
-    # def create(self, data):
-    #     """
-    #         Does the plotting.
-    #     """
-
-    #     if len(data[0][1]) != len(data[1][1]):
-    #         raise ScatterException('Number of instances for each competitor must be the same')
-
-    #     # trying to remove duplicated points with the same coordinates
-    #     xs, ys = self.remove_dups(zip(data[0][1], data[1][1]))
-
-    #     step = int((self.x_max - self.x_min) / 10)
-    #     x = np.arange(self.x_min, self.x_max + self.x_min + step, step)
-
-    #     # "good" area
-    #     plt.plot(x, x, color='black', ls=':', lw=1.5, zorder=3)
-    #     plt.plot(x, 0.1 * x, 'g:', lw=1.5, zorder=3)
-    #     plt.plot(x, 10 * x, 'g:', lw=1.5, zorder=3)
-    #     plt.fill_between(x, 0.1 * x, 10 * x, facecolor='green', alpha=0.15,
-    #         zorder=3)
-
-    #     plt.xlim([self.x_min, self.x_max])
-    #     plt.ylim([self.y_min, self.y_max])
-
-    #     # timeout lines
-    #     plt.axvline(self.timeout, linewidth=1, color='red', ls=':',
-    #         label=str(self.timeout), zorder=3)
-    #     plt.axhline(self.timeout, linewidth=1, color='red', ls=':',
-    #         label=str(self.timeout), zorder=3)
-
-    #     if self.tlb_loc == 'after':
-    #         plt.text(2 * self.x_min, self.timeout + self.x_max / 40,
-    #             self.t_label, horizontalalignment='left',
-    #             verticalalignment='bottom', fontsize=self.f_props['size'] * 0.8)
-    #         plt.text(self.timeout + self.x_max / 40, 2 * self.x_min,
-    #             self.t_label, horizontalalignment='left',
-    #             verticalalignment='bottom', fontsize=self.f_props['size'] * 0.8,
-    #             rotation=90)
-    #     else:
-    #         plt.text(2 * self.x_min, self.timeout - self.x_max / 3.5,
-    #             self.t_label, horizontalalignment='left',
-    #             verticalalignment='bottom', fontsize=self.f_props['size'] * 0.8)
-    #         plt.text(self.timeout - self.x_max / 3.5, 2 * self.x_min,
-    #             self.t_label, horizontalalignment='left',
-    #             verticalalignment='bottom', fontsize=self.f_props['size'] * 0.8,
-    #             rotation=90)
-
-    #     # making the scatter plot step by step for each level
-    #     print sum([len(x) for x in xs]), len(data[0][1])
-    #     xx = []
-    #     yy = []
-    #     rgba_c =[]
-    #     rgba_e =[]
-    #     for l in range(len(xs)):
-    #         xx.extend(xs[l])
-    #         yy.extend(ys[l])
-
-    #         # ctuple = (1., 0., 0., 1 - (1.0 - self.alpha) ** (l + 1))
-    #         # rgba_c.extend([ctuple for i in xs[l]])
-
-    #         # etuple = (0., 0., 0., 1 - (1.0 - self.alpha) ** (l + 1))
-    #         # rgba_e.extend([etuple for i in xs[l]])
-
-    #     # plt.scatter(xx, yy, c=rgba_c, marker='o', edgecolor=rgba_e, s=25, zorder=5)
-    #     plt.scatter(xx, yy, c='r', marker='o', alpha=self.alpha, s=25, zorder=5)
-
-    #     # axes' labels
-    #     if self.x_label:
-    #         plt.xlabel(self.x_label)
-    #     else:
-    #         plt.xlabel(data[0][0])
-
-    #     if self.y_label:
-    #         plt.ylabel(self.y_label)
-    #     else:
-    #         plt.ylabel(data[1][0])
-
-    #     # turning the grid on
-    #     if not self.no_grid:
-    #         plt.grid(True, color='black', ls=':', lw=1, zorder=1)
-
-    #     # choosing logarithmic scales
-    #     ax = plt.gca()
-    #     ax.set_xscale('log')
-    #     ax.set_yscale('log')
-
-    #     # setting ticks font properties
-    #     ax.set_xticklabels(ax.get_xticks(), self.f_props)
-    #     ax.set_yticklabels(ax.get_yticks(), self.f_props)
-
-    #     # formatter
-    #     majorFormatter = plt.LogFormatterMathtext(base=10)
-    #     ax.xaxis.set_major_formatter(majorFormatter)
-    #     ax.yaxis.set_major_formatter(majorFormatter)
-
-    #     # setting frame thickness
-    #     for i in six.itervalues(ax.spines):
-    #         i.set_linewidth(1)
-
-    #     plt.savefig(self.save_to, bbox_inches='tight', transparent=self.transparent)
-
-    # def remove_dups(self, data):
-    #     """
-    #         Removes duplicated points.
-    #     """
-
-    #     pset = set([])
-    #     pdup = {}
-    #     distance = lambda p,q: ((p[0] - q[0]) ** 2 + (p[1] - q[1]) ** 2) ** 0.5
-
-    #     for p in data:
-    #         for q in pset:
-    #             if distance(p, q) == 0:
-    #                 pdup[q] += 1
-    #                 break
-    #         else:
-    #             pdup[p] = 1
-    #             pset.add(p)
-
-    #     maxdups = max(six.itervalues(pdup))
-    #     xs = [[] for i in range(maxdups)]
-    #     ys = [[] for i in range(maxdups)]
-
-    #     for p, l in six.iteritems(pdup):
-    #         xs[l - 1].append(p[0])
-    #         ys[l - 1].append(p[1])
-
-    #     return xs, ys
+
+#
+#==============================================================================
+def merge_points(xs, ys, tol):
+    """
+        Merges the points lying in the same cell of a grid in log space,
+        with cells of tol decades (if tol is 0, only coincident points
+        are merged). Returns the coordinates of the merged points (the
+        geometric means of their points) and the number of points merged
+        into each of them.
+    """
+
+    lx, ly = np.log10(xs), np.log10(ys)
+
+    codes = lx + 1j * ly
+    if tol > 0:
+        codes = np.floor(lx / tol) + 1j * np.floor(ly / tol)
+
+    codes, inv, counts = np.unique(codes, return_inverse=True, return_counts=True)
+    inv = inv.ravel()
+
+    lx = np.bincount(inv, weights=lx, minlength=len(codes)) / counts
+    ly = np.bincount(inv, weights=ly, minlength=len(codes)) / counts
+
+    return 10 ** lx, 10 ** ly, counts
@@ -0,0 +1,203 @@
+#!/usr/bin/env python
+#-*- coding:utf-8 -*-
+##
+## statcache.py
+##
+##  Created on: Oct 17, 2026
+##
+
+#
+#==============================================================================
+import hashlib
+import json
+import numpy as np
+import os
+import shutil
+from statutil import Stat
+import sys
+import tempfile
+import time
+
+
+#
+#==============================================================================
+class StatCache:
+    """
+        Content-addressed on-disk cache of parsed STAT files.
+
+        The columns of a parsed file (see Stat.columns()) are stored as
+        a directory objs/<digest>-<keys>, where digest is the SHA-1 of
+        the file's content, holding the instance names, the status
+        vector and one float64 column per measured key (saved as .npy
+        arrays, which are memory-mapped on loading). Files in refs/ map
+        a path, a size and an mtime to the content digest so that
+        unchanged files are never re-hashed.
+    """
+
+    def __init__(self, path, max_size=None, max_age=None):
+        """
+            Constructor. Maximum size is in MiB and age is in days.
+        """
+
+        self.path = os.path.expanduser(path)
+        self.max_size = max_size
+        self.max_age = max_age
+
+        self.refs = os.path.join(self.path, 'refs')
+        self.objs = os.path.join(self.path, 'objs')
+
+        for d in (self.refs, self.objs):
+            if not os.path.isdir(d):
+                try:
+                    os.makedirs(d)
+                except OSError:
+                    pass  # created by a concurrent process
+
+    def read_columns(self, filename, keys):
+        """
+            Reads the columns of a file (see Stat.columns()) either from
+            the cache or by parsing it and then storing them in the cache.
+        """
+
+        entry = self.entry(filename, keys)
+
+        if os.path.isdir(entry):
+            print('reading {0} (cached)'.format(filename), file=sys.stderr)
+            columns = self.load(entry, keys)
+            columns[0]['origin'] = filename
+        else:
+            columns = Stat(filename, keys=keys).columns(keys)
+            self.store(entry, keys, columns)
+
+        return columns
+
+    def entry(self, filename, keys):
+        """
+            Returns the path to the cache entry of a file.
+        """
+
+        st = os.stat(filename)
+        stamp = '{0}\n{1}\n{2}'.format(os.path.realpath(filename),
+                st.st_size, st.st_mtime)
+
+        ref = os.path.join(self.refs, hashlib.sha1(stamp.encode('utf-8')).hexdigest())
+        if os.path.isfile(ref):
+            with open(ref, 'r') as fp:
+                digest = fp.read().strip()
+        else:
+            digest = self.hash(filename)
+
+            fd, tmp = tempfile.mkstemp(prefix='.tmp', dir=self.refs)
+            with os.fdopen(fd, 'w') as fp:
+                fp.write(digest)
+            os.rename(tmp, ref)
+
+        kdigest = hashlib.sha1('\n'.join(keys).encode('utf-8')).hexdigest()
+        return os.path.join(self.objs, '{0}-{1}'.format(digest, kdigest[:16]))
+
+    def hash(self, filename):
+        """
+            Computes the digest of a file's content.
+        """
+
+        sha = hashlib.sha1()
+        with open(filename, 'rb') as fp:
+            for chunk in iter(lambda: fp.read(1 << 20), b''):
+                sha.update(chunk)
+
+        return sha.hexdigest()
+
+    def load(self, entry, keys):
+        """
+            Loads the columns of a file from a cache entry.
+        """
+
+        with open(os.path.join(entry, 'meta.json'), 'r') as fp:
+            meta = json.load(fp)
+
+        with open(os.path.join(entry, 'insts.txt'), 'rb') as fp:
+            insts = fp.read().decode('utf-8').split('\n') if meta['size'] else []
+
+        status = np.load(os.path.join(entry, 'status.npy'), mmap_mode='r')
+        values = {k: np.load(os.path.join(entry, 'key{0}.npy'.format(i)), mmap_mode='r')
+                for i, k in enumerate(keys) if k != 'status'}
+
+        # marking the entry as recently used
+        os.utime(entry, None)
+
+        return meta['preamble'], insts, status, values
+
+    def store(self, entry, keys, columns):
+        """
+            Saves the columns of a file to a cache entry.
+        """
+
+        preamble, insts, status, values = columns
+
+        preamble = dict(preamble)
+        del(preamble['origin'])
+
+        tmp = tempfile.mkdtemp(prefix='.tmp', dir=self.objs)
+        try:
+            with open(os.path.join(tmp, 'insts.txt'), 'wb') as fp:
+                fp.write('\n'.join(insts).encode('utf-8'))
+
+            np.save(os.path.join(tmp, 'status.npy'), status)
+            for i, k in enumerate(keys):
+                if k != 'status':
+                    np.save(os.path.join(tmp, 'key{0}.npy'.format(i)), values[k])
+
+            with open(os.path.join(tmp, 'meta.json'), 'w') as fp:
+                json.dump({'keys': keys, 'size': len(insts), 'preamble': preamble}, fp)
+
+            os.rename(tmp, entry)
+        except OSError:
+            pass  # either stored concurrently or not writable
+        finally:
+            if os.path.isdir(tmp):
+                shutil.rmtree(tmp, ignore_errors=True)
+
+    def evict(self):
+        """
+            Removes entries older than the maximum age and then the least
+            recently used entries until the cache fits the maximum size.
+        """
+
+        entries = []
+        for name in os.listdir(self.objs):
+            if name.startswith('.'):
+                continue  # being written
+
+            entry = os.path.join(self.objs, name)
+            try:
+                size = sum(os.path.getsize(os.path.join(entry, f)) for f in os.listdir(entry))
+                entries.append((os.path.getmtime(entry), size, entry))
+            except OSError:
+                continue
+
+        entries.sort()
+
+        if self.max_age is not None:
+            now = time.time()
+            while entries and now - entries[0][0] > self.max_age * 86400:
+                shutil.rmtree(entries.pop(0)[2], ignore_errors=True)
+
+        if self.max_size is not None:
+            total = sum(e[1] for e in entries)
+            while entries and total > self.max_size * 1048576:
+                total -= entries[0][1]
+                shutil.rmtree(entries.pop(0)[2], ignore_errors=True)
+
+        # dropping references to evicted content
+        digests = set(e[2].rsplit(os.sep, 1)[1].split('-')[0] for e in entries)
+        for name in os.listdir(self.refs):
+            if name.startswith('.'):
+                continue
+
+            ref = os.path.join(self.refs, name)
+            try:
+                with open(ref, 'r') as fp:
+                    if fp.read().strip() not in digests:
+                        os.remove(ref)
+            except (IOError, OSError):
+                continue
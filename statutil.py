@@ -10,8 +10,16 @@
 
 #
 #==============================================================================
-from __future__ import print_function
+import bz2
+from collections.abc import Mapping, Sequence
+import functools
+import gzip
+import io
 import json
+import lzma
+import multiprocessing
+import numpy as np
+import os
 import sys
 
 
@@ -21,6 +29,210 @@ class JSONException(Exception):
     pass
 
 
+#
+#==============================================================================
+class TableException(Exception):
+    pass
+
+
+#
+#==============================================================================
+def open_file(filename, mode='r'):
+    """
+        Opens a file. Files compressed with gzip, bzip2 or xz are
+        decompressed on the fly when read (the compression is detected by
+        their content) and compressed when written (the compression is
+        chosen by the extension of their name).
+    """
+
+    if 'w' in mode:
+        compress = {'.gz': gzip.open, '.bz2': bz2.open, '.xz': lzma.open}.get(
+                filename[len(strip_ext(filename)):].lower())
+
+        if compress is None:
+            return open(filename, mode)
+
+        return compress(filename, mode if 'b' in mode else mode + 't')
+
+    with open(filename, 'rb') as fp:
+        head = fp.read(6)
+
+    if head[:2] == b'\x1f\x8b':
+        fp = gzip.open(filename, 'rb')
+    elif head[:3] == b'BZh':
+        fp = bz2.BZ2File(filename, 'rb')
+    elif head == b'\xfd7zXZ\x00':
+        fp = lzma.open(filename, 'rb')
+    else:
+        return open(filename, mode)
+
+    return io.TextIOWrapper(fp) if 'b' not in mode else fp
+
+
+#
+#==============================================================================
+def strip_ext(filename):
+    """
+        Removes the extension of a compressed file, if any.
+    """
+
+    for ext in ('.gz', '.bz2', '.xz'):
+        if filename.lower().endswith(ext):
+            return filename[:-len(ext)]
+
+    return filename
+
+
+#
+#==============================================================================
+def to_float(val):
+    """
+        Converts a numeric STAT value into a float (NaN if not numeric).
+    """
+
+    if type(val) in (int, float):
+        return float(val)
+
+    return np.nan
+
+
+#
+#==============================================================================
+def read_columns(filename, keys, cache=None):
+    """
+        Reads a STAT file (possibly through a StatCache object) and
+        returns its columns, see Stat.columns().
+    """
+
+    if cache is not None:
+        return cache.read_columns(filename, keys)
+
+    return Stat(filename, keys=keys).columns(keys)
+
+
+#
+#==============================================================================
+class StatReader:
+    """
+        Incremental reader of STAT files. The file is consumed chunk by
+        chunk and only one instance record of the 'stats' object is
+        decoded at a time, of which only the requested keys are kept.
+    """
+
+    def __init__(self, fp, chunk_sz=65536):
+        """
+            Constructor.
+        """
+
+        self.fp = fp
+        self.chunk_sz = chunk_sz
+        self.decoder = json.JSONDecoder()
+
+        self.buf = ''
+        self.pos = 0
+        self.eof = False
+
+    def read(self, keys):
+        """
+            Reads the whole file and returns a (preamble, stats) pair.
+        """
+
+        preamble, stats = {}, {}
+
+        self.expect('{')
+        while self.skip_ws() != '}':
+            name = self.value()
+            self.expect(':')
+
+            if name == 'stats':
+                self.expect('{')
+                while self.skip_ws() != '}':
+                    inst = self.value()
+                    self.expect(':')
+                    rec = self.value()
+                    stats[inst] = {k: rec[k] for k in keys if k in rec}
+                    self.separator('}')
+                self.pos += 1
+            elif name == 'preamble':
+                preamble = self.value()
+            else:
+                self.value()  # unused top-level data
+
+            self.separator('}')
+
+        return preamble, stats
+
+    def fill(self, size=None):
+        """
+            Reads another chunk of data into the buffer.
+        """
+
+        if self.pos:
+            self.buf = self.buf[self.pos:]
+            self.pos = 0
+
+        chunk = self.fp.read(max(size or 0, self.chunk_sz))
+        if chunk:
+            self.buf += chunk
+        else:
+            self.eof = True
+
+    def skip_ws(self):
+        """
+            Skips whitespace and returns the next character.
+        """
+
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in ' \t\n\r':
+                self.pos += 1
+
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            elif self.eof:
+                raise ValueError('unexpected end of data')
+
+            self.fill()
+
+    def expect(self, char):
+        """
+            Consumes the given character.
+        """
+
+        if self.skip_ws() != char:
+            raise ValueError('expected \'{0}\' at position {1}'.format(char, self.pos))
+
+        self.pos += 1
+
+    def separator(self, end):
+        """
+            Consumes a comma unless the end of the container is reached.
+        """
+
+        if self.skip_ws() != end:
+            self.expect(',')
+
+    def value(self):
+        """
+            Decodes a JSON value, reading more data if it is incomplete.
+        """
+
+        self.skip_ws()
+
+        while True:
+            try:
+                obj, end = self.decoder.raw_decode(self.buf, self.pos)
+            except ValueError:
+                if self.eof:
+                    raise
+            else:
+                # a number may continue in the next chunk
+                if end < len(self.buf) or self.eof:
+                    self.pos = end
+                    return obj
+
+            self.fill(len(self.buf) - self.pos)
+
+
 #
 #==============================================================================
 class Stat:
@@ -28,7 +240,7 @@ class Stat:
         Simple statistical data class.
     """
 
-    def __init__(self, filename=None):
+    def __init__(self, filename=None, keys=None):
         """
             Constructor.
         """
@@ -40,21 +252,27 @@ class Stat:
         elif type(filename) is list:
             print( 'in case of several files use "StatArray" class', file=sys.stderr)
         else:
-            self.read(filename)
+            self.read(filename, keys=keys)
 
-    def read(self, filename=None):
+    def read(self, filename=None, keys=None):
         """
-            Reads a file into a Stat object.
+            Reads a file into a Stat object. If a list of keys is given,
+            the file is streamed and only these keys are kept for each
+            instance; otherwise, the whole document is loaded.
         """
 
         if filename is None:
             print( 'no filename was specified', file=sys.stderr)
             return
 
-        with open(filename, 'r') as fp:
+        with open_file(filename, 'r') as fp:
             print('reading {0}'.format(filename), file=sys.stderr)
             try:
-                data_full = json.load(fp)
+                if keys is None:
+                    data_full = json.load(fp)
+                else:
+                    preamble, stats = StatReader(fp).read(keys)
+                    data_full = {'preamble': preamble, 'stats': stats}
             except:
                 raise JSONException('Unable to parse \'{0}\'.'.format(filename))
 
@@ -64,9 +282,40 @@ class Stat:
 
         self.insts_own = sorted(list(set(self.data.keys())))
 
+    def columns(self, keys):
+        """
+            Returns the preamble, the instance names, the status vector
+            and a dictionary of float vectors with the values of the keys.
+            Missing and non-numeric values are NaN.
+        """
+
+        recs = [self.data[inst] for inst in self.insts_own]
+
+        status = np.array([rec['status'] == True for rec in recs], dtype=bool)
+        values = {k: np.array([to_float(rec.get(k)) for rec in recs], dtype=np.float64)
+                for k in keys if k != 'status'}
+
+        return self.preamble, self.insts_own, status, values
+
+    def numeric_keys(self):
+        """
+            Returns the keys having numeric values only.
+        """
+
+        keys, other = set(), set(['status'])
+        for rec in self.data.values():
+            for k, v in rec.items():
+                if type(v) in (int, float):
+                    keys.add(k)
+                else:
+                    other.add(k)
+
+        return sorted(keys.difference(other))
+
     def write(self, to=None):
         """
-            Writes a Stat object to a file.
+            Writes a Stat object to a file (compressed as given by the
+            extension of its name, see open_file()).
         """
 
         to_write = {'preamble': self.preamble, 'stats': self.data}
@@ -78,9 +327,9 @@ class Stat:
         del(self.preamble['origin'])
 
         if type(to) is str:
-            with open(to, 'w') as fp:
+            with open_file(to, 'w') as fp:
                 json.dump(to_write, fp, indent=4, separators=(',', ': '))
-        elif type(to) is file:
+        elif hasattr(to, 'write'):
             json.dump(to_write, to, indent=4, separators=(',', ': '))
         else:
             print('don\'t know how to write to {0}'.format(type(to)), file=sys.stderr)
@@ -131,26 +380,506 @@ class Stat:
                         print('{0}: {1} = {2}'.format(inst, crit['key'], self.data[inst][crit['key']]))
 
 
+#
+#==============================================================================
+class StatMatrix:
+    """
+        Columnar representation of the data of several Stat objects.
+
+        Instance names are interned: a row index refers to an element of
+        the sorted list insts. All matrices are solver-major, i.e. row j
+        holds the data of solver j over all the instances: status is a
+        boolean matrix, present masks out the instances a solver did not
+        run, and metrics maps each measured key to a float matrix whose
+        missing or non-numeric values are NaN.
+    """
+
+    def __init__(self, insts=None, preambles=None, status=None, present=None,
+            metrics=None):
+        """
+            Constructor.
+        """
+
+        self.insts = insts if insts is not None else []
+        self.preambles = preambles if preambles is not None else []
+        self.status = status if status is not None else np.zeros((0, len(self.insts)), dtype=bool)
+        self.present = present if present is not None else np.zeros((0, len(self.insts)), dtype=bool)
+        self.metrics = metrics if metrics is not None else {}
+
+        self._index = None
+
+    def __len__(self):
+        return len(self.preambles)
+
+    @property
+    def index(self):
+        """
+            Row index of every instance name.
+        """
+
+        if self._index is None:
+            self._index = {inst: i for i, inst in enumerate(self.insts)}
+
+        return self._index
+
+    @classmethod
+    def from_columns(cls, columns, dtype=np.float64):
+        """
+            Creates a matrix from a list of Stat columns, see
+            Stat.columns().
+        """
+
+        insts = sorted(set().union(*[col[1] for col in columns]))
+        index = {inst: i for i, inst in enumerate(insts)}
+        shape = (len(columns), len(insts))
+
+        status = np.zeros(shape, dtype=bool)
+        present = np.zeros(shape, dtype=bool)
+        metrics = {k: np.full(shape, np.nan, dtype=dtype)
+                for k in set().union(*[col[3] for col in columns])}
+
+        for j, (preamble, names, st, values) in enumerate(columns):
+            rows = np.fromiter((index[inst] for inst in names), dtype=np.int64, count=len(names))
+
+            present[j, rows] = True
+            status[j, rows] = st
+            for k, vals in values.items():
+                metrics[k][j, rows] = vals
+
+        matrix = cls(insts, [col[0] for col in columns], status, present, metrics)
+        matrix._index = index
+
+        return matrix
+
+    @classmethod
+    def from_stats(cls, stat_objs, keys=None, dtype=np.float64):
+        """
+            Creates a matrix from Stat objects. By default, all the keys
+            having numeric values are stored.
+        """
+
+        if keys is None:
+            keys = sorted(set().union(*[stat_obj.numeric_keys() for stat_obj in stat_objs]))
+
+        return cls.from_columns([stat_obj.columns(keys) for stat_obj in stat_objs], dtype=dtype)
+
+    @classmethod
+    def from_table(cls, names, insts, values, keys, origin=None):
+        """
+            Creates a matrix from a CSV table of values (instances by
+            tools). The values are stored under each of the given keys.
+            Every value is marked as finished; whether it is solved
+            depends on the timeout, which is applied on loading. The
+            preamble of each tool refers to the table. Instance names
+            must be unique.
+        """
+
+        # rows of a single table are numbered and thus unique
+        names_seen, counts = np.unique(np.asarray(insts if not isinstance(insts, range) else [],
+            dtype=str), return_counts=True)
+        if len(counts) and counts.max() > 1:
+            raise TableException('Instance \'{0}\' appears more than once in \'{1}\'.'.format(
+                names_seen[counts.argmax()], origin if origin else 'table'))
+
+        values = np.ascontiguousarray(values.T, dtype=np.float64)
+        status = ~np.isnan(values)
+
+        origin = origin if origin else ''
+        preambles = [{'program': n, 'benchmark': os.path.basename(origin),
+            'table': origin} for n in names]
+
+        return cls(list(insts), preambles, status,
+                np.ones(values.shape, dtype=bool), {k: values for k in keys})
+
+    @classmethod
+    def concat(cls, matrices):
+        """
+            Combines the tools of several matrices. Instances are matched
+            by name; tools not run on an instance have it missing.
+        """
+
+        insts = sorted(set().union(*[matrix.insts for matrix in matrices]))
+        index = {inst: i for i, inst in enumerate(insts)}
+        shape = (sum([len(matrix) for matrix in matrices]), len(insts))
+
+        status = np.zeros(shape, dtype=bool)
+        present = np.zeros(shape, dtype=bool)
+        metrics = {k: np.full(shape, np.nan) for k in set().union(*[matrix.metrics for matrix in matrices])}
+        preambles = []
+
+        for matrix in matrices:
+            rows = np.array([index[inst] for inst in matrix.insts], dtype=np.int64)
+            js = slice(len(preambles), len(preambles) + len(matrix))
+
+            status[js, rows] = matrix.status
+            present[js, rows] = matrix.present
+            for k, vals in matrix.metrics.items():
+                metrics[k][js, rows] = vals
+
+            preambles.extend(matrix.preambles)
+
+        return cls(insts, preambles, status, present, metrics)
+
+    def append(self, preamble, status, present, metrics):
+        """
+            Adds the column of another solver.
+        """
+
+        self.preambles.append(preamble)
+        self.status = np.vstack([self.status, status])
+        self.present = np.vstack([self.present, present])
+
+        for k in self.metrics:
+            self.metrics[k] = np.vstack([self.metrics[k], metrics[k]])
+
+    def row(self, inst):
+        """
+            Returns the row of an instance name (None if unknown).
+        """
+
+        if isinstance(self.insts, JoinedInsts):
+            return self.insts.find(inst)
+
+        return self.index.get(inst)
+
+    def cluster(self, use_key=['program', 'prog_args']):
+        """
+            Joins solvers having the same values of the given preamble
+            keys, similarly to StatArray.cluster(). An instance of the
+            joined matrix is a pair of an original instance and a
+            benchmark (see JoinedInsts); no instance names are created.
+        """
+
+        if type(use_key) is not list:
+            use_key = [use_key]
+
+        groups, benches = {}, {}
+        for j, p in enumerate(self.preambles):
+            groups.setdefault(' '.join([p[k] for k in use_key]), []).append(j)
+            benches.setdefault(p['benchmark'], len(benches))
+
+        nof_benches = len(benches)
+        bids = np.array([benches[p['benchmark']] for p in self.preambles], dtype=np.int64)
+
+        # joined instances are encoded as instance * nof_benchmarks + benchmark
+        codes = np.unique(np.concatenate([np.flatnonzero(self.present[j]) * nof_benches + bids[j]
+            for j in range(len(self))] + [np.zeros(0, dtype=np.int64)]))
+
+        shape = (len(groups), len(codes))
+        status = np.zeros(shape, dtype=bool)
+        present = np.zeros(shape, dtype=bool)
+        metrics = {k: np.full(shape, np.nan, dtype=v.dtype) for k, v in self.metrics.items()}
+        preambles = []
+
+        for g, members in enumerate(groups.values()):
+            preamble = dict(self.preambles[members[0]])
+            for k in ('benchmark', 'runsolver_args'):
+                if k in preamble:
+                    preamble[k] = [self.preambles[j][k] for j in members]
+            preambles.append(preamble)
+
+            for j in members:
+                rows = np.flatnonzero(self.present[j])
+                pos = np.searchsorted(codes, rows * nof_benches + bids[j])
+
+                present[g, pos] = True
+                status[g, pos] = self.status[j, rows]
+                for k in self.metrics:
+                    metrics[k][g, pos] = self.metrics[k][j, rows]
+
+        bnames = sorted(benches, key=lambda b: benches[b])
+        insts = JoinedInsts(self.insts, bnames, codes, index=self._index)
+
+        return StatMatrix(insts, preambles, status, present, metrics)
+
+    def uncluster(self):
+        """
+            Splits the solvers of a clustered matrix back by benchmark.
+            This is the inverse of cluster() up to the order of solvers.
+        """
+
+        if not isinstance(self.insts, JoinedInsts):
+            return self
+
+        inst_ids, bench_ids = self.insts.pairs()
+        bindex = {b: i for i, b in enumerate(self.insts.benches)}
+
+        members = []
+        for g, p in enumerate(self.preambles):
+            for k, bench in enumerate(p['benchmark']):
+                preamble = dict(p)
+                preamble['benchmark'] = bench
+                if 'runsolver_args' in p:
+                    preamble['runsolver_args'] = p['runsolver_args'][k]
+
+                members.append((g, np.flatnonzero(self.present[g] & (bench_ids == bindex[bench])), preamble))
+
+        shape = (len(members), len(self.insts.insts))
+        status = np.zeros(shape, dtype=bool)
+        present = np.zeros(shape, dtype=bool)
+        metrics = {k: np.full(shape, np.nan, dtype=v.dtype) for k, v in self.metrics.items()}
+
+        for j, (g, pos, preamble) in enumerate(members):
+            rows = inst_ids[pos]
+
+            present[j, rows] = True
+            status[j, rows] = self.status[g, pos]
+            for k in self.metrics:
+                metrics[k][j, rows] = self.metrics[k][g, pos]
+
+        matrix = StatMatrix(self.insts.insts, [m[2] for m in members], status, present, metrics)
+        matrix._index = self.insts.index
+
+        return matrix
+
+
+#
+#==============================================================================
+class JoinedInsts(Sequence):
+    """
+        Instance names of a clustered StatMatrix. Each instance is a pair
+        of an original instance and a benchmark encoded as a single code;
+        its name 'inst@benchmark' is created only when accessed.
+    """
+
+    def __init__(self, insts, benches, codes, index=None):
+        """
+            Constructor.
+        """
+
+        self.insts = insts
+        self.benches = benches
+        self.codes = codes
+        self._index = index
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[k] for k in range(*i.indices(len(self)))]
+
+        inst, bench = divmod(int(self.codes[i]), len(self.benches))
+        return '{0}@{1}'.format(self.insts[inst], self.benches[bench])
+
+    def __len__(self):
+        return len(self.codes)
+
+    @property
+    def index(self):
+        """
+            Index of the original instance names.
+        """
+
+        if self._index is None:
+            self._index = {inst: i for i, inst in enumerate(self.insts)}
+
+        return self._index
+
+    def pairs(self):
+        """
+            Returns the vectors of instance and benchmark indices.
+        """
+
+        return np.divmod(self.codes, len(self.benches))
+
+    def find(self, name):
+        """
+            Returns the position of a joined instance name (or None).
+        """
+
+        inst, _, bench = name.rpartition('@')
+        if inst not in self.index or bench not in self.benches:
+            return None
+
+        code = self.index[inst] * len(self.benches) + self.benches.index(bench)
+        pos = int(np.searchsorted(self.codes, code))
+
+        return pos if pos < len(self.codes) and self.codes[pos] == code else None
+
+
+#
+#==============================================================================
+class StatData(Mapping):
+    """
+        Read-only dictionary of instance records of one solver of a
+        StatMatrix. A record is created when accessed. Its values are
+        those stored in the matrix, i.e. floats (an integer 12 of a STAT
+        file is 12.0), and non-numeric keys are missing; the original
+        records are given by StatView.full().
+    """
+
+    def __init__(self, matrix, col):
+        """
+            Constructor.
+        """
+
+        self.matrix = matrix
+        self.col = col
+
+    def __getitem__(self, inst):
+        row = self.matrix.row(inst)
+        if row is None or not self.matrix.present[self.col, row]:
+            raise KeyError(inst)
+
+        rec = {}
+        for k, vals in self.matrix.metrics.items():
+            val = vals[self.col, row]
+            if val == val:  # NaN is missing
+                rec[k] = float(val)
+
+        rec['status'] = bool(self.matrix.status[self.col, row])
+        return rec
+
+    def __iter__(self):
+        insts = self.matrix.insts
+        for row in np.flatnonzero(self.matrix.present[self.col]).tolist():
+            yield insts[row]
+
+    def __len__(self):
+        return int(self.matrix.present[self.col].sum())
+
+
+#
+#==============================================================================
+class StatView(Stat, object):
+    """
+        Stat object backed by a column of a StatMatrix. Its records are
+        read-only; updating a view changes the status in the matrix.
+        Listing, updating and writing use the full records of the origin
+        file (see full()), since the matrix keeps numeric keys only.
+    """
+
+    def __init__(self, matrix, col, from_file=False):
+        """
+            Constructor. A view is made from a file if its origin is a
+            STAT file read into the matrix.
+        """
+
+        self.matrix = matrix
+        self.col = col
+        self.from_file = from_file
+        self.preamble = matrix.preambles[col]
+        self.data = StatData(matrix, col)
+
+        self._insts_own = None
+
+    @property
+    def insts_own(self):
+        if self._insts_own is None:
+            self._insts_own = list(self.data)
+
+        return self._insts_own
+
+    def columns(self, keys):
+        """
+            Returns the columns of the view, see Stat.columns().
+        """
+
+        rows = self.matrix.present[self.col]
+        values = {k: self.matrix.metrics[k][self.col, rows] for k in keys
+                if k in self.matrix.metrics}
+
+        return self.preamble, self.insts_own, self.matrix.status[self.col, rows], values
+
+    def numeric_keys(self):
+        """
+            Returns the keys having numeric values.
+        """
+
+        return sorted(self.matrix.metrics.keys())
+
+    def full(self):
+        """
+            Returns a Stat object with the full records of the view read
+            from its origin file, their status being taken from the
+            matrix. If the view is not made from a file (e.g. it comes
+            from a results pack or a table) or is clustered, the records
+            are those of the view.
+        """
+
+        origin = self.preamble.get('origin')
+
+        if self.from_file and isinstance(origin, str) and \
+                os.path.isfile(origin) and not isinstance(self.matrix.insts, JoinedInsts):
+            stat_obj = Stat(origin)
+            stat_obj.preamble = dict(self.preamble)
+
+            for inst, rec in stat_obj.data.items():
+                row = self.matrix.row(inst)
+                if row is not None and self.matrix.present[self.col, row]:
+                    rec['status'] = bool(self.matrix.status[self.col, row])
+        else:
+            stat_obj = self.records()
+
+        return stat_obj
+
+    def records(self):
+        """
+            Returns a Stat object holding a copy of the records of the
+            view, which can then be modified.
+        """
+
+        stat_obj = Stat()
+        stat_obj.preamble = dict(self.preamble)
+        stat_obj.insts_own = list(self.insts_own)
+        stat_obj.data = {inst: self.data[inst] for inst in self.insts_own}
+
+        return stat_obj
+
+    def update(self, success=None, failure=None):
+        """
+            Updates the status in the matrix using additional success and
+            failure signs (see Stat.update()) and writes the view.
+        """
+
+        stat_obj = self.full()
+        stat_obj.update(success, failure)
+
+        for inst in stat_obj.insts_own:
+            row = self.matrix.row(inst)
+            if row is not None and self.matrix.present[self.col, row]:
+                self.matrix.status[self.col, row] = stat_obj.data[inst]['status'] == True
+
+    def list(self, crit=None):
+        """
+            Lists instances satisfying the criterion, see Stat.list().
+        """
+
+        if crit:
+            self.full().list(crit)
+
+    def write(self, to=None):
+        """
+            Writes the full records of the view to a file.
+        """
+
+        self.full().write(to)
+
+
 #
 #==============================================================================
 class StatArray:
     """
-        Contains statistical data for several files.
+        Contains statistical data for several files. The data are also
+        kept in a StatMatrix object (core), which is used for processing.
+        If the files are read with a list of keys, the Stat objects are
+        views of the core (see StatView).
     """
 
-    def __init__(self, files=None):
+    def __init__(self, files=None, jobs=1, keys=None, cache=None, dtype=np.float64):
         """
             Constructor.
         """
 
+        self.dtype = dtype
+
         if files is None:
             self.inst_full = []
             self.stat_objs = []
+            self.core = StatMatrix()
         elif type(files) is list:
-            self.read(files)
+            self.read(files, jobs=jobs, keys=keys, cache=cache)
         else:
             print('in case of just one file use "Stat" class', file=sys.stderr)
-            self.read([files])
+            self.read([files], jobs=jobs, keys=keys, cache=cache)
 
     def __getitem__(self, key):
         if key < len(self.stat_objs):
@@ -163,23 +892,70 @@ class StatArray:
         for stat_obj in self.stat_objs:
             yield stat_obj
 
-    def read(self, files=None):
+    @classmethod
+    def from_matrix(cls, matrix):
         """
-            Reads several files into a StatArray object.
+            Creates a StatArray object of views of a StatMatrix.
+        """
+
+        stat_arr = cls()
+        stat_arr.set_core(matrix)
+
+        return stat_arr
+
+    def set_core(self, matrix, from_files=False):
+        """
+            Replaces the data with the views of a StatMatrix (made from
+            the files read if so specified, see StatView).
+        """
+
+        self.core = matrix
+        self.stat_objs = [StatView(matrix, j, from_files) for j in range(len(matrix))]
+        self.inst_full = matrix.insts
+
+    def sync(self):
+        """
+            Rebuilds the core from the (modified) Stat objects.
+        """
+
+        self.core = StatMatrix.from_stats(self.stat_objs, dtype=self.dtype)
+        self.inst_full = self.core.insts
+
+    def read(self, files=None, jobs=1, keys=None, cache=None):
+        """
+            Reads several files into a StatArray object. If jobs is
+            greater than 1, the files are parsed by a pool of worker
+            processes; the order of Stat objects is preserved. If a list
+            of keys is given, only these keys are read (see Stat.read())
+            and each worker returns compact columns, possibly read
+            through a StatCache object.
         """
 
         if files is None:
             print('no files was specified', file=sys.stderr)
             return
 
-        self.stat_objs = []
-        for f in files:
-            self.stat_objs.append(Stat(f))
+        if keys is None:
+            reader = Stat
+        else:
+            reader = functools.partial(read_columns, keys=keys, cache=cache)
 
-        inst_set = set()
-        for stat_obj in self.stat_objs:
-            inst_set = inst_set.union(set(stat_obj.insts_own))
-        self.inst_full = sorted(list(inst_set))
+        jobs = min(jobs, len(files))
+        if jobs > 1:
+            pool = multiprocessing.Pool(jobs)
+            try:
+                results = pool.map(reader, files, chunksize=1)
+            finally:
+                pool.close()
+                pool.join()
+        else:
+            results = [reader(f) for f in files]
+
+        if keys is None:
+            self.stat_objs = results
+            self.sync()
+        else:
+            self.set_core(StatMatrix.from_columns(results, dtype=self.dtype), from_files=True)
 
     def write(self, files=None):
         """
@@ -197,48 +973,87 @@ class StatArray:
     def cluster(self, use_key=['program', 'prog_args']):
         """
             Clasters Stat objects according to their preamble values.
+            Views of the core are clustered without renaming instances
+            (see StatMatrix.cluster()); instances of other Stat objects
+            are renamed to 'inst@benchmark'.
         """
 
+        if all(isinstance(stat_obj, StatView) for stat_obj in self.stat_objs):
+            self.set_core(self.core.cluster(use_key))
+            return
+
         # the key should be a list
         if type(use_key) is not list:
             use_key = [use_key]
 
+        # views (e.g. a VBS) cannot be renamed, thus they are copied
+        self.stat_objs = [stat_obj.records() if isinstance(stat_obj, StatView) else stat_obj
+                for stat_obj in self.stat_objs]
+
         clusters = {}
 
         for stat_obj in self.stat_objs:
             # updating the Stat object
-            for i, i_old in enumerate(stat_obj.insts_own):
-                i_new = '{0}@{1}'.format(i_old, stat_obj.preamble['benchmark'])
-                stat_obj.insts_own[i] = i_new
-                stat_obj.data[i_new] = stat_obj.data.pop(i_old)
+            bench = stat_obj.preamble['benchmark']
+            stat_obj.insts_own = ['{0}@{1}'.format(inst, bench) for inst in stat_obj.insts_own]
+            stat_obj.data = {'{0}@{1}'.format(inst, bench): rec for inst, rec in stat_obj.data.items()}
 
             key = ' '.join([stat_obj.preamble[one_key] for one_key in use_key])
             if key in clusters:
                 # update the cluster
-                clusters[key].insts_own.extend(stat_obj.insts_own)
-                clusters[key].data.update(stat_obj.data)
-
-                clusters[key].preamble['benchmark'].append(stat_obj.preamble['benchmark'])
-                clusters[key].preamble['runsolver_args'].append(stat_obj.preamble['runsolver_args'])
+                clusters[key].append(stat_obj)
             else:
                 # add new cluster
-                clusters[key] = stat_obj
-                clusters[key].preamble['benchmark'] = [clusters[key].preamble['benchmark']]
-                clusters[key].preamble['runsolver_args'] = [clusters[key].preamble['runsolver_args']]
+                clusters[key] = [stat_obj]
 
-        self.stat_objs = [cl for cl in clusters.values()]
+        self.stat_objs = []
+        for members in clusters.values():
+            cl = members[0]
+            for k in ('benchmark', 'runsolver_args'):
+                if k in cl.preamble:
+                    cl.preamble[k] = [stat_obj.preamble[k] for stat_obj in members]
 
-        inst_set = set()
-        for stat_obj in self.stat_objs:
-            inst_set = inst_set.union(set(stat_obj.insts_own))
-        self.inst_full = sorted(list(inst_set))
+            for stat_obj in members[1:]:
+                cl.insts_own.extend(stat_obj.insts_own)
+                cl.data.update(stat_obj.data)
+
+            self.stat_objs.append(cl)
+
+        self.sync()
 
     def unclaster(self):
         """
             Unclasters previously clastered Stat objects.
         """
 
-        print('unclaster() method is not implemented yet', file=sys.stderr)
+        if all(isinstance(stat_obj, StatView) for stat_obj in self.stat_objs):
+            self.set_core(self.core.uncluster())
+            return
+
+        stat_objs = []
+        for cl in self.stat_objs:
+            if type(cl.preamble.get('benchmark')) is not list:
+                stat_objs.append(cl)  # not clastered
+                continue
+
+            members = {}
+            for k, bench in enumerate(cl.preamble['benchmark']):
+                stat_obj = Stat()
+                stat_obj.preamble = dict(cl.preamble)
+                stat_obj.preamble['benchmark'] = bench
+                if 'runsolver_args' in cl.preamble:
+                    stat_obj.preamble['runsolver_args'] = cl.preamble['runsolver_args'][k]
+
+                members[bench] = stat_obj
+                stat_objs.append(stat_obj)
+
+            for name in cl.insts_own:
+                inst, _, bench = name.rpartition('@')
+                members[bench].insts_own.append(inst)
+                members[bench].data[inst] = cl.data[name]
+
+        self.stat_objs = stat_objs
+        self.sync()
 
     def make_vbs(self, addit_key=None):
         """
@@ -246,34 +1061,46 @@ class StatArray:
             NOTE: the use of addit_key is not implemented yet.
         """
 
-        vbs = Stat()
-        vbs.insts_own = self.inst_full
+        core = self.core
+        cols = np.arange(len(core.insts))
 
-        vbs.preamble = self.stat_objs[0].preamble
-        vbs.preamble['program'] = 'vbs'
-        vbs.preamble['prog_args'] = ''
-        vbs.preamble['origin'] = [obj.preamble['origin'] for obj in self.stat_objs]
+        with np.errstate(invalid='ignore'):
+            rtime = np.where(core.status & ~np.isnan(core.metrics['rtime']), core.metrics['rtime'], np.inf)
 
-        for inst in self.inst_full:
-            alts = []
-            for stat_obj in self.stat_objs:
-                if inst in stat_obj.data and stat_obj.data[inst]['status'] == True:
-                    alts.append(stat_obj.data[inst])
+        # the record of the fastest solver, or of any solver if all fail
+        best = np.where(np.isfinite(rtime.min(axis=0)), rtime.argmin(axis=0), core.present.argmax(axis=0))
 
-            if alts:
-                vbs.data[inst] = min(alts, key=lambda x: x['rtime'])
-            else:
-                # all fail; choose any:
-                vbs.data[inst] = self.stat_objs[0].data[inst]
+        preamble = dict(self.stat_objs[0].preamble)
+        preamble['program'] = 'vbs'
+        preamble['prog_args'] = ''
+        preamble['origin'] = [obj.preamble['origin'] for obj in self.stat_objs]
+
+        core.append(preamble, core.status[best, cols], core.present.any(axis=0),
+                {k: v[best, cols] for k, v in core.metrics.items()})
 
-        self.stat_objs.append(vbs)
+        self.stat_objs.append(StatView(core, len(core) - 1))
 
     def compare(self, cmp_key=None):
         """
             Compares values for a specific key. Do nothing if cmp_key is None.
         """
 
-        if cmp_key:
+        if cmp_key and cmp_key in self.core.metrics:
+            core = self.core
+            vals = np.where(core.status & core.present, core.metrics[cmp_key], np.nan)
+
+            # NaN values are ignored by fmin and fmax
+            lo, hi = np.fmin.reduce(vals, axis=0), np.fmax.reduce(vals, axis=0)
+
+            for row in np.flatnonzero(lo < hi).tolist():
+                found = {}
+                for j in np.flatnonzero(~np.isnan(vals[:, row])).tolist():
+                    found.setdefault(float(vals[j, row]), []).append(core.preambles[j]['origin'])
+
+                print('different values found', file=sys.stderr)
+                print('instance:', core.insts[row], file=sys.stderr)
+                print('values:', found, file=sys.stderr)
+        elif cmp_key:  # non-numeric values
             for inst in self.inst_full:
                 vals = {}
 
@@ -303,23 +1130,22 @@ class StatArray:
             else:
                 status = False if to_list == 'failed' else True
 
-                for inst in self.inst_full:
-                    objs = []
-
-                    for stat_obj in self.stat_objs:
-                        if inst in stat_obj.data and stat_obj.data[inst]['status'] == status:
-                            p = stat_obj.preamble
-                            if 'prog_alias' in p:
-                                objs.append(p['prog_alias'])
-                            else:
-                                objs.append(p['program'] + ' ' + p['prog_args'])
-
-                    if objs:
-                        if len(self.stat_objs) > 1:
-                            objs = '[{0}]'.format(', '.join(obj for obj in objs))
-                            print('{0}: {1}'.format(inst, objs))
-                        else:
-                            print(inst)
+                names = []
+                for p in self.core.preambles:
+                    if 'prog_alias' in p:
+                        names.append(p['prog_alias'])
+                    else:
+                        names.append(p['program'] + ' ' + p['prog_args'])
+
+                mask = self.core.present & (self.core.status == status)
+
+                for row in np.flatnonzero(mask.any(axis=0)).tolist():
+                    if len(self.stat_objs) > 1:
+                        objs = [names[j] for j in np.flatnonzero(mask[:, row]).tolist()]
+                        objs = '[{0}]'.format(', '.join(obj for obj in objs))
+                        print('{0}: {1}'.format(self.core.insts[row], objs))
+                    else:
+                        print(self.core.insts[row])
 
     def list(self, crit=None):
         """
@@ -338,3 +1164,7 @@ class StatArray:
         if success or failure:
             for stat_obj in self.stat_objs:
                 stat_obj.update(success, failure)
+
+            # views update the core themselves
+            if not all(isinstance(stat_obj, StatView) for stat_obj in self.stat_objs):
+                self.sync()
@@ -0,0 +1,272 @@
+#!/usr/bin/env python
+#-*- coding:utf-8 -*-
+##
+## summary.py
+##
+##  Created on: Oct 17, 2026
+##
+
+#
+#==============================================================================
+from bootstrap import intervals
+import collections
+import csv
+import json
+from load import value_bounds
+import numpy as np
+from statutil import JoinedInsts
+from util import tex_escape
+
+
+#
+#==============================================================================
+def summarize(labels, values, solved, present, insts, options):
+    """
+        Computes the statistics of the tools given the matrices made by
+        load_columns(). Values of solved instances are clamped as in
+        the plots and unsolved ones count as timeouts, except for PAR
+        scores, which penalize them with k times the timeout. Geometric
+        means are over the instances solved by all the tools shown and
+        families are made by instance directories (or by benchmarks if
+        tools are joined). Tools are filtered, renamed and ranked as in
+        the plots. If bootstrap resamples are requested, the confidence
+        intervals of the number of solved instances, of the PAR2 score
+        and of the rank of each tool are added (see intervals()).
+        Returns a list of dictionaries, one per tool.
+    """
+
+    min_val, timeout, max_value = value_bounds(options)
+    pcts = options['stats_pcts']
+
+    rows = [j for j, label in enumerate(labels) if not options['only'] or label in options['only']]
+    if options['repls']:
+        labels = [options['repls'].get(label, label) for label in labels]
+
+    fnames, fids = families(insts)
+    forder = np.argsort(fids, kind='stable')
+    fstarts = np.flatnonzero(np.r_[True, np.diff(fids[forder]) != 0])
+
+    # rows are processed in chunks not to copy the whole matrix at once
+    step = max(1, (1 << 24) // max(1, values.shape[1]))
+    chunks = [rows[i:i + step] for i in range(0, len(rows), step)]
+
+    stats = collections.defaultdict(list)
+    common = np.ones(values.shape[1], dtype=bool)
+
+    for chunk in chunks:
+        p = present[chunk]
+        s = solved[chunk] & p
+        v = np.clip(values[chunk], min_val, timeout)
+        v[~s | np.isnan(v)] = timeout
+
+        n = p.sum(axis=1)
+        nz = np.maximum(n, 1)
+
+        nsolved = s.sum(axis=1)
+        vsolved = v.sum(axis=1, where=s)
+
+        stats['solved'].append(nsolved)
+        stats['instances'].append(n)
+        stats['total'].append(vsolved + (n - nsolved) * max_value)
+        stats['mean'].append(np.where(n, (vsolved + (n - nsolved) * timeout) / nz, np.nan))
+
+        for k in (2, 10):
+            par = (vsolved + (n - nsolved) * k * timeout) / nz
+            stats['par{0}'.format(k)].append(np.where(n, par, np.nan))
+
+        # order statistics of the sorted values (missing ones are last)
+        if not p.all():
+            v[~p] = np.nan
+        v.sort(axis=1)
+        stats['min'].append(v[:, 0] if v.shape[1] else np.full(len(chunk), np.nan))
+        stats['max'].append(percentile(v, n, 100))
+        stats['median'].append(percentile(v, n, 50))
+        for q in pcts:
+            stats['p{0:g}'.format(q)].append(percentile(v, n, q))
+
+        if len(fnames) == 1:
+            stats['families'].append(nsolved[:, None])
+        elif len(fnames):
+            stats['families'].append(np.add.reduceat(s[:, forder].astype(np.int64), fstarts, axis=1))
+
+        common &= s.all(axis=0)
+
+    # geometric means over the commonly solved instances
+    cols = np.flatnonzero(common)
+    for chunk in chunks:
+        v = values[chunk][:, cols]
+        v = np.clip(np.where(np.isnan(v), timeout, v), min_val, timeout)
+        stats['gmean'].append(np.exp(np.log(v).mean(axis=1)) if len(cols) else np.full(len(chunk), np.nan))
+
+    stats = {k: np.concatenate(v) if v else np.zeros(0) for k, v in stats.items()}
+
+    if options['bootstrap']:
+        cis = intervals(values, solved, present, rows, options)
+
+    result = []
+    for i, j in enumerate(rows):
+        tool = collections.OrderedDict([('tool', labels[j])])
+        for k in ['solved', 'instances', 'min', 'max', 'mean', 'median'] + \
+                ['p{0:g}'.format(q) for q in pcts] + ['par2', 'par10', 'gmean']:
+            tool[k] = to_value(stats[k][i])
+
+        tool['common'] = len(cols)
+        tool['families'] = collections.OrderedDict([(f, int(stats['families'][i, g]))
+            for g, f in enumerate(fnames)])
+
+        if options['bootstrap']:
+            for k in ('solved', 'par2', 'rank'):
+                tool[k + '_ci'] = [to_value(b) for b in cis[k][i]]
+
+        # the ranking of select()
+        total = float(stats['total'][i])
+        result.append((stats['solved'][i] + (stats['instances'][i] / total if total else 0), tool))
+
+    result.sort(key=lambda pair: pair[0], reverse=not options['reverse'])
+
+    if options['bootstrap']:
+        for r, (key, tool) in enumerate(result):
+            tool['rank'] = r + 1
+
+    return [tool for key, tool in result]
+
+
+#
+#==============================================================================
+def percentile(vals, sizes, q):
+    """
+        Computes the q-th percentile (with linear interpolation) of each
+        row of a sorted matrix, the first sizes[i] values of row i being
+        the only ones to take into account.
+    """
+
+    pos = (q / 100.0) * np.maximum(sizes - 1, 0)
+    lo = np.floor(pos).astype(np.int64)
+    hi = np.minimum(lo + 1, np.maximum(sizes - 1, 0))
+
+    if not vals.shape[1]:
+        return np.full(len(sizes), np.nan)
+
+    vlo = np.take_along_axis(vals, lo[:, None], axis=1)[:, 0]
+    vhi = np.take_along_axis(vals, hi[:, None], axis=1)[:, 0]
+
+    return np.where(sizes > 0, vlo + (vhi - vlo) * (pos - lo), np.nan)
+
+
+#
+#==============================================================================
+def families(insts):
+    """
+        Splits the instances into families: the benchmarks of joined
+        instances or otherwise the directories in instance names. Returns
+        the sorted names of the families and the family of each instance.
+    """
+
+    if isinstance(insts, JoinedInsts):
+        names, ids = np.unique(insts.pairs()[1], return_inverse=True)
+        return [insts.benches[b] for b in names], ids.ravel()
+
+    index = {}
+    ids = np.array([index.setdefault(str(inst).rpartition('/')[0] or '.', len(index))
+        for inst in insts], dtype=np.int64)
+
+    names = sorted(index)
+    ranks = {name: r for r, name in enumerate(names)}
+
+    return names, np.array([ranks[name] for name in index], dtype=np.int64)[ids]
+
+
+#
+#==============================================================================
+def to_value(val):
+    """
+        Converts a NumPy scalar into a number, NaN being None.
+    """
+
+    if isinstance(val, (np.integer, np.bool_)):
+        return int(val)
+
+    return None if np.isnan(val) else float(val)
+
+
+#
+#==============================================================================
+def write_stats(stats, fmt, fp):
+    """
+        Writes the statistics of the tools in one of the formats: text,
+        json, csv or tex. If no format is given, only the number of
+        solved instances and the minimal, maximal and average values are
+        written as text (along with the confidence intervals, if any).
+    """
+
+    if fmt == 'json':
+        json.dump(stats, fp, indent=4)
+        fp.write('\n')
+    elif fmt == 'csv':
+        keys = [k for k in stats[0] if k != 'families'] if stats else []
+        fams = list(stats[0]['families']) if stats else []
+
+        # intervals take two columns
+        header = sum([[k[:-3] + '_lo', k[:-3] + '_hi'] if k.endswith('_ci') else [k] for k in keys], [])
+
+        writer = csv.writer(fp, lineterminator='\n')
+        writer.writerow(header + ['solved:' + f for f in fams])
+        for tool in stats:
+            row = sum([tool[k] if k.endswith('_ci') else [tool[k]] for k in keys], [])
+            writer.writerow([v if v is not None else '' for v in row] +
+                    [tool['families'][f] for f in fams])
+    elif fmt == 'tex':
+        fp.write('\\begin{tabular}{lrrrrr}\n\\hline\n')
+        fp.write('Tool & Solved & PAR2 & PAR10 & Median & Geo. mean \\\\\n\\hline\n')
+        for tool in stats:
+            solved, par2 = str(tool['solved']), tex_num(tool['par2'])
+            if 'solved_ci' in tool:
+                solved += ' [{0:g}, {1:g}]'.format(*tool['solved_ci'])
+                par2 += ' [{0}, {1}]'.format(*[tex_num(b) for b in tool['par2_ci']])
+
+            fp.write('{0} & {1} & {2} & {3} & {4} & {5} \\\\\n'.format(tex_escape(tool['tool']),
+                solved, par2, *[tex_num(tool[k]) for k in ('par10', 'median', 'gmean')]))
+        fp.write('\\hline\n\\end{tabular}\n')
+    else:
+        for tool in stats:
+            print('{0}:'.format(tool['tool']), file=fp)
+            print('    # solved: {0}'.format(tool['solved']), file=fp)
+            print('    min. val: {0}'.format(txt_num(tool['min'])), file=fp)
+            print('    max. val: {0}'.format(txt_num(tool['max'])), file=fp)
+            print('    avg. val: {0}'.format(txt_num(tool['mean'])), file=fp)
+
+            if fmt:
+                print('    med. val: {0}'.format(txt_num(tool['median'])), file=fp)
+                print('    par2 val: {0}'.format(txt_num(tool['par2'])), file=fp)
+                print('    par10 val: {0}'.format(txt_num(tool['par10'])), file=fp)
+                print('    geo. val: {0} ({1} common)'.format(txt_num(tool['gmean']), tool['common']), file=fp)
+
+            if 'solved_ci' in tool:
+                print('    solved CI: [{0:g}, {1:g}]'.format(*tool['solved_ci']), file=fp)
+                print('    par2 CI: [{0}, {1}]'.format(*[txt_num(b) for b in tool['par2_ci']]), file=fp)
+                print('    rank: {0} [{1:g}, {2:g}]'.format(tool['rank'], *tool['rank_ci']), file=fp)
+
+            if fmt and len(tool['families']) > 1:
+                print('    families: {0}'.format(', '.join(['{0} {1}'.format(f, c)
+                    for f, c in tool['families'].items()])), file=fp)
+
+
+#
+#==============================================================================
+def txt_num(val):
+    """
+        Formats a value for the terminal.
+    """
+
+    return '{0:.1f}'.format(val) if val is not None else 'n/a'
+
+
+#
+#==============================================================================
+def tex_num(val):
+    """
+        Formats a value for a LaTeX table.
+    """
+
+    return '{0:.2f}'.format(val) if val is not None else '--'
+
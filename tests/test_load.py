@@ -0,0 +1,149 @@
+#!/usr/bin/env python
+#-*- coding:utf-8 -*-
+##
+## test_load.py
+##
+##  Created on: Oct 17, 2026
+##
+
+#
+#==============================================================================
+import json
+import numpy as np
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from load import load_json, make_vbs
+from statutil import StatArray
+
+
+#
+#==============================================================================
+def load_reference(stat_arr, options):
+    """
+        Loads the data of the tools and of the VBSes instance by
+        instance, as done before vectorizing them.
+    """
+
+    timeout = float(options['timeout'])
+    min_val = options['y_min'] if options['plot_type'] == 'scatter' else 0.000000001
+    max_value = timeout if options['plot_type'] == 'scatter' else 10 * timeout
+
+    data = []
+    for stat_obj in stat_arr:
+        vals, num_solved, last_val = [], 0, -1
+        for inst in stat_obj.insts_own:
+            val = stat_obj.data[inst].get(options['key'], timeout)
+            if stat_obj.data[inst]['status'] == True:
+                last_val = max(last_val, val)
+                val = min(max(val, min_val), timeout)
+                num_solved += 1
+            else:
+                val = max_value
+
+            vals.append(val)
+
+        data.append((stat_obj.preamble['program'], vals, num_solved, last_val))
+
+    for vbs_name, tools in options['vbs'].items():
+        vals, num_solved, last_val = [], 0, -1
+        for inst in stat_arr.inst_full:
+            best = max_value
+            for stat_obj in stat_arr:
+                if tools != 'all' and stat_obj.preamble['program'] not in tools:
+                    continue
+
+                d = stat_obj.data.get(inst, {})
+                if d.get('status') == True and d.get(options['key'], timeout) < timeout:
+                    best = min(best, max(d[options['key']], min_val))
+
+            if best < max_value:
+                last_val = max(last_val, best)
+                num_solved += 1
+
+            vals.append(best)
+
+        data.append((vbs_name, vals, num_solved, last_val))
+
+    return data
+
+
+#
+#==============================================================================
+class LoadTest(unittest.TestCase):
+    """
+        Loading tools and VBSes from whole columns.
+    """
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+
+        with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'defaults.json'), 'r') as fp:
+            self.options = json.load(fp)['settings']
+
+        self.options['timeout'] = 100.0
+        self.options['vbs'] = {'vbs-all': 'all', 'vbs-ab': ['a', 'b'], 'vbs-none': ['z']}
+
+        rng = np.random.RandomState(1)
+
+        self.files = []
+        for tool in ('a', 'b', 'c', 'd'):
+            stats = {}
+            for i in range(40):
+                if rng.rand() < 0.1:
+                    continue  # not run
+
+                rec = {'status': bool(rng.rand() < 0.7)}
+                if rng.rand() < 0.9:
+                    # some solved instances are past the timeout
+                    rec['rtime'] = float(np.round(rng.uniform(0.01, 120.0), 2))
+
+                stats['inst{0:02d}'.format(i)] = rec
+
+            fn = os.path.join(self.tmp, '{0}.json'.format(tool))
+            with open(fn, 'w') as fp:
+                json.dump({'preamble': {'program': tool, 'prog_args': '',
+                    'benchmark': 'bench'}, 'stats': stats}, fp)
+
+            self.files.append(fn)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def check(self, options):
+        data = load_json(StatArray(self.files), options)
+        expected = {d[0]: d for d in load_reference(StatArray(self.files), options)}
+
+        self.assertEqual(sorted(d[0] for d in data), sorted(expected))
+        for label, vals, num_solved, last_val in data:
+            self.assertTrue(np.allclose(vals, expected[label][1]), label)
+            self.assertEqual(num_solved, expected[label][2], label)
+            self.assertAlmostEqual(last_val, expected[label][3], msg=label)
+
+    def test_cactus(self):
+        self.check(self.options)
+
+    def test_scatter(self):
+        self.options['plot_type'] = 'scatter'
+        self.check(self.options)
+
+    def test_make_vbs(self):
+        best = np.array([[1.0, np.inf, 3.0], [2.0, 0.5, np.inf], [np.inf, np.inf, 0.1]])
+        orig = best.copy()
+
+        vbses = dict(make_vbs(best, ['a', 'b', 'c'], {'all': 'all', 'ab': ['a', 'b'], 'none': ['z']}))
+        self.assertEqual(vbses['all'].tolist(), [1.0, 0.5, 0.1])
+        self.assertEqual(vbses['ab'].tolist(), [1.0, 0.5, 3.0])
+        self.assertTrue(np.isinf(vbses['none']).all())
+        self.assertTrue(np.array_equal(best, orig))
+
+
+#
+#==============================================================================
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python
+#-*- coding:utf-8 -*-
+##
+## test_pack.py
+##
+##  Created on: Oct 17, 2026
+##
+
+#
+#==============================================================================
+import json
+import numpy as np
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from mkpack import origin_names, unpack_names
+from pack import PackException, ResultsPack, is_pack
+from statutil import Stat, StatArray
+
+
+#
+#==============================================================================
+class ResultsPackTest(unittest.TestCase):
+    """
+        Writing a pack and reading it back.
+    """
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.keys = ['status', 'rtime', 'conflicts']
+
+        # 11 instances, so that the bitmaps do not fill whole bytes
+        self.files = []
+        for i in range(3):
+            stats = {}
+            for j in range(11):
+                if (i + j) % 5 == 0:
+                    continue  # not run
+
+                stats['inst{0}'.format(j)] = {'status': (i * j) % 3 != 1, 'rtime': i + j / 4.0}
+                if j % 2:
+                    stats['inst{0}'.format(j)]['conflicts'] = i * 100 + j
+
+            fn = os.path.join(self.tmp, 'solver{0}.json'.format(i))
+            with open(fn, 'w') as fp:
+                json.dump({'preamble': {'program': 'solver{0}'.format(i),
+                    'prog_args': '', 'benchmark': 'bench'}, 'stats': stats}, fp)
+
+            self.files.append(fn)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def test_round_trip(self):
+        core = StatArray(self.files, keys=self.keys).core
+
+        fn = os.path.join(self.tmp, 'results.pack')
+        ResultsPack.from_matrix(core).write(fn)
+        self.assertTrue(is_pack(fn))
+        self.assertFalse(is_pack(self.files[0]))
+
+        pack = ResultsPack.read(fn)
+        self.assertEqual(list(pack.insts), list(core.insts))
+        self.assertEqual(pack.preambles, core.preambles)
+        self.assertTrue(np.array_equal(pack.status, core.status))
+        self.assertTrue(np.array_equal(pack.present, core.present))
+        self.assertEqual(sorted(pack.metrics), sorted(core.metrics))
+        for k in core.metrics:
+            self.assertTrue(np.array_equal(pack.metrics[k], core.metrics[k], equal_nan=True))
+
+        # the views of a pack hold the data of the files
+        for stat_obj, f in zip(pack.to_stats(), self.files):
+            self.assertEqual(stat_obj.data, Stat(f, keys=self.keys).data)
+
+    def test_not_pack(self):
+        with self.assertRaises(PackException):
+            ResultsPack.read(self.files[0])
+
+
+#
+#==============================================================================
+class PackNamesTest(unittest.TestCase):
+    """
+        Names of the files stored in a pack and unpacked from it.
+    """
+
+    def test_origin_names(self):
+        origins = [os.path.join(os.sep, 'runs', 'a', 'x.json'),
+                os.path.join(os.sep, 'runs', 'b', 'c', 'y.json.gz')]
+        self.assertEqual(origin_names(origins), [os.path.join('a', 'x.json'),
+            os.path.join('b', 'c', 'y.json.gz')])
+
+        self.assertEqual(origin_names([os.path.join(os.sep, 'runs', 'x.json')]), ['x.json'])
+        self.assertEqual(origin_names([]), [])
+
+    def test_unpack_names(self):
+        origins = [os.path.join('a', 'x.json.gz'), os.path.join('a', 'x.json'),
+                os.path.join('a', 'x.json.bz2'), os.path.join(os.sep, 'etc', 'y.json'),
+                os.path.join(os.pardir, 'z.json')]
+        self.assertEqual(unpack_names(origins), [os.path.join('a', 'x.json'),
+            os.path.join('a', 'x-1.json'), os.path.join('a', 'x-2.json'), 'y.json', 'z.json'])
+
+
+#
+#==============================================================================
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,126 @@
+#!/usr/bin/env python
+#-*- coding:utf-8 -*-
+##
+## test_pairwise.py
+##
+##  Created on: Oct 17, 2026
+##
+
+#
+#==============================================================================
+import json
+import math
+import numpy as np
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from load import make_series, select, value_bounds
+from pairwise import compare
+
+
+#
+#==============================================================================
+def compare_reference(labels, values, solved, present, options):
+    """
+        Compares every pair of tools instance by instance.
+    """
+
+    min_val, timeout, max_value = value_bounds(options)
+
+    def value(j, i):
+        v = values[j, i]
+        return timeout if math.isnan(v) else min(max(v, min_val), timeout)
+
+    result = {}
+    for a, la in enumerate(labels):
+        for b, lb in enumerate(labels):
+            wins, only, both, logs = 0, 0, 0, 0.0
+            for i in range(values.shape[1]):
+                if not (present[a, i] and present[b, i]) or not solved[a, i]:
+                    continue
+
+                if not solved[b, i]:
+                    wins += 1
+                    only += 1
+                else:
+                    wins += value(a, i) < value(b, i)
+                    both += 1
+                    logs += math.log(value(b, i)) - math.log(value(a, i))
+
+            result[la, lb] = (wins, only, both, math.exp(logs / both) if both else None)
+
+    return result
+
+
+#
+#==============================================================================
+class CompareTest(unittest.TestCase):
+    """
+        Pairwise wins, timeouts and speed-ups of the tools.
+    """
+
+    def setUp(self):
+        with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'defaults.json'), 'r') as fp:
+            self.options = json.load(fp)['settings']
+
+        self.options['timeout'] = 100.0
+
+        rng = np.random.RandomState(3)
+        shape = (5, 80)
+
+        self.labels = ['tool{0}'.format(j) for j in range(shape[0])]
+        self.values = np.round(rng.uniform(0.001, 120.0, shape), 1)
+        self.values[rng.rand(*shape) < 0.05] = np.nan
+        self.solved = rng.rand(*shape) < 0.7
+        self.present = rng.rand(*shape) < 0.9
+
+        # a tool running no instance at all
+        self.present[4, :] = False
+
+    def test_compare(self):
+        pairs = compare(self.labels, self.values, self.solved, self.present, None, self.options)
+        expected = compare_reference(self.labels, self.values, self.solved, self.present, self.options)
+
+        tools = pairs['tools']
+        self.assertEqual(sorted(tools), self.labels)
+
+        for a, la in enumerate(tools):
+            self.assertEqual(pairs['solved'][a], int((self.solved & self.present)[self.labels.index(la)].sum()))
+
+            for b, lb in enumerate(tools):
+                wins, only, both, speedup = expected[la, lb]
+                self.assertEqual(pairs['wins'][a][b], wins, (la, lb))
+                self.assertEqual(pairs['timeouts'][a][b], only, (la, lb))
+                self.assertEqual(pairs['common'][a][b], both, (la, lb))
+
+                if speedup is None:
+                    self.assertIsNone(pairs['speedup'][a][b])
+                else:
+                    self.assertAlmostEqual(pairs['speedup'][a][b], speedup)
+
+    def test_ranking(self):
+        pairs = compare(self.labels, self.values, self.solved, self.present, None, self.options)
+
+        # tools are ranked as in the plots
+        min_val, timeout, max_value = value_bounds(self.options)
+        data = [make_series(label, self.values[j, self.present[j]], self.solved[j, self.present[j]],
+            min_val, timeout, max_value) for j, label in enumerate(self.labels[:4])]
+
+        self.assertEqual(pairs['tools'][:4], [d[0] for d in select(data, self.options)])
+
+    def test_filter(self):
+        self.options['only'] = ['tool0', 'tool2']
+        self.options['repls'] = {'tool2': 'best'}
+
+        pairs = compare(self.labels, self.values, self.solved, self.present, None, self.options)
+        self.assertEqual(sorted(pairs['tools']), ['best', 'tool0'])
+        self.assertEqual(len(pairs['wins']), 2)
+
+
+#
+#==============================================================================
+if __name__ == '__main__':
+    unittest.main()
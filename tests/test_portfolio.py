@@ -0,0 +1,97 @@
+#!/usr/bin/env python
+#-*- coding:utf-8 -*-
+##
+## test_portfolio.py
+##
+##  Created on: Oct 17, 2026
+##
+
+#
+#==============================================================================
+import itertools
+import json
+import numpy as np
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from portfolio import Objective, branch_and_bound, greedy, make_portfolio
+
+
+#
+#==============================================================================
+class PortfolioTest(unittest.TestCase):
+    """
+        Greedy and exact selection of portfolios.
+    """
+
+    def setUp(self):
+        with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'defaults.json'), 'r') as fp:
+            self.options = json.load(fp)['settings']
+
+        self.options['timeout'] = 100.0
+
+    def random_objectives(self):
+        rng = np.random.RandomState(4)
+
+        for trial in range(10):
+            shape = (7, rng.randint(5, 40))
+            solved = rng.rand(*shape) < rng.uniform(0.1, 0.6)
+            values = np.where(solved, np.round(rng.uniform(1.0, 100.0, shape)), 200.0)
+
+            for by in ('solved', 'par2'):
+                yield Objective(solved, values, by)
+
+    def brute_force(self, objective, size):
+        return max(objective.score(objective.union(rows))
+                for rows in itertools.combinations(range(len(objective.states)), size))
+
+    def test_exact(self):
+        for objective in self.random_objectives():
+            for size in range(1, len(objective.states) + 1):
+                initial = greedy(objective, size)
+                chosen = branch_and_bound(objective, size, initial)
+
+                self.assertEqual(len(chosen), size)
+                self.assertEqual(len(set(chosen)), size)
+
+                score = objective.score(objective.union(chosen))
+                self.assertGreaterEqual(score, objective.score(objective.union(initial)))
+                self.assertAlmostEqual(score, self.brute_force(objective, size))
+
+    def test_greedy_suboptimal(self):
+        # the first tool solves the most instances alone, but the other
+        # two solve all of them together
+        solved = np.array([[1, 1, 1, 1, 0, 0], [1, 1, 0, 0, 1, 0], [0, 0, 1, 1, 0, 1]], dtype=bool)
+        objective = Objective(solved, None, 'solved')
+
+        initial = greedy(objective, 2)
+        self.assertEqual(initial[0], 0)
+        self.assertEqual(objective.score(objective.union(initial)), 5)
+
+        self.assertEqual(sorted(branch_and_bound(objective, 2, initial)), [1, 2])
+
+    def test_make_portfolio(self):
+        labels = ['a', 'b', 'c']
+        solved = np.array([[1, 1, 1, 1, 0, 0], [1, 1, 0, 0, 1, 0], [0, 0, 1, 1, 0, 1]], dtype=bool)
+        values = np.where(solved, 10.0, np.nan)
+        present = np.ones(solved.shape, dtype=bool)
+
+        self.options['portfolio'] = 2
+        self.assertEqual(make_portfolio(labels, values, solved, present, None, self.options)[:2], (['a', 'b'], 5))
+
+        self.options['portfolio_exact'] = True
+        tools, num_solved, par2 = make_portfolio(labels, values, solved, present, None, self.options)
+        self.assertEqual((sorted(tools), num_solved, par2), (['b', 'c'], 6, 10.0))
+
+        # instances not run are unsolved
+        present[2, 5] = False
+        self.assertEqual(make_portfolio(labels, values, solved, present, None, self.options)[1], 5)
+
+
+#
+#==============================================================================
+if __name__ == '__main__':
+    unittest.main()
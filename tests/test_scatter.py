@@ -0,0 +1,104 @@
+#!/usr/bin/env python
+#-*- coding:utf-8 -*-
+##
+## test_scatter.py
+##
+##  Created on: Oct 17, 2026
+##
+
+#
+#==============================================================================
+import collections
+import math
+import numpy as np
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from scatter import merge_points
+
+
+#
+#==============================================================================
+def merge_reference(xs, ys, tol):
+    """
+        Merges the points one by one with a dictionary of grid cells.
+    """
+
+    cells = collections.defaultdict(list)
+    for x, y in zip(xs, ys):
+        if tol > 0:
+            cell = (math.floor(math.log10(x) / tol), math.floor(math.log10(y) / tol))
+        else:
+            cell = (x, y)
+
+        cells[cell].append((math.log10(x), math.log10(y)))
+
+    return [(10 ** np.mean([p[0] for p in pts]), 10 ** np.mean([p[1] for p in pts]), len(pts))
+            for pts in cells.values()]
+
+
+#
+#==============================================================================
+def sort_points(points):
+    """
+        Sorts merged points by their coordinates rounded so that rounding
+        errors of the means do not change the order.
+    """
+
+    return sorted(points, key=lambda p: (round(p[0], 6), round(p[1], 6)))
+
+
+#
+#==============================================================================
+class MergePointsTest(unittest.TestCase):
+    """
+        Merging coincident and nearby points of scatter plots.
+    """
+
+    def setUp(self):
+        rng = np.random.RandomState(2)
+
+        # values on a coarse grid, so that many points coincide
+        self.xs = np.round(10 ** rng.uniform(-2, 3, 500), 1) + 0.01
+        self.ys = np.round(10 ** rng.uniform(-2, 3, 500), 1) + 0.01
+        self.xs[:50] = 1000.0  # timeouts
+        self.ys[25:75] = 1000.0
+
+    def check(self, tol):
+        mx, my, counts = merge_points(self.xs, self.ys, tol)
+        self.assertEqual(len(mx), len(my))
+        self.assertEqual(len(mx), len(counts))
+        self.assertEqual(int(counts.sum()), len(self.xs))
+
+        merged = sort_points(zip(mx.tolist(), my.tolist(), counts.tolist()))
+        expected = sort_points(merge_reference(self.xs, self.ys, tol))
+
+        self.assertEqual([p[2] for p in merged], [p[2] for p in expected])
+        self.assertTrue(np.allclose([p[:2] for p in merged], [p[:2] for p in expected]))
+
+        return merged
+
+    def test_coincident(self):
+        merged = self.check(0)
+        self.assertLess(len(merged), len(self.xs))
+        self.assertIn((1000.0, 1000.0, 25), [(round(x, 6), round(y, 6), c) for x, y, c in merged])
+
+    def test_tolerance(self):
+        for tol in (0.01, 0.1, 0.5):
+            self.check(tol)
+
+        self.assertLess(len(self.check(0.5)), len(self.check(0.01)))
+
+    def test_distinct(self):
+        mx, my, counts = merge_points(np.array([1.0, 2.0, 3.0]), np.array([3.0, 2.0, 1.0]), 0)
+        self.assertEqual(counts.tolist(), [1, 1, 1])
+        self.assertTrue(np.allclose(sorted(zip(mx, my)), [(1, 3), (2, 2), (3, 1)]))
+
+
+#
+#==============================================================================
+if __name__ == '__main__':
+    unittest.main()
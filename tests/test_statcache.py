@@ -0,0 +1,129 @@
+#!/usr/bin/env python
+#-*- coding:utf-8 -*-
+##
+## test_statcache.py
+##
+##  Created on: Oct 17, 2026
+##
+
+#
+#==============================================================================
+import json
+import numpy as np
+import os
+import shutil
+import sys
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from statcache import StatCache
+
+
+#
+#==============================================================================
+class StatCacheTest(unittest.TestCase):
+    """
+        Reading STAT files through the cache and evicting its entries.
+    """
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.cache = StatCache(os.path.join(self.tmp, 'cache'))
+        self.keys = ['status', 'rtime']
+
+        self.files = []
+        for i in range(2):
+            fn = os.path.join(self.tmp, 'solver{0}.json'.format(i))
+            self.write(fn, i)
+            self.files.append(fn)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def write(self, fn, seed):
+        stats = {'inst{0}'.format(j): {'status': j % 2 == 0, 'rtime': seed + j * 0.5}
+                for j in range(5)}
+
+        with open(fn, 'w') as fp:
+            json.dump({'preamble': {'program': 'solver{0}'.format(seed),
+                'prog_args': '', 'benchmark': 'bench'}, 'stats': stats}, fp)
+
+    def entries(self):
+        return sorted(n for n in os.listdir(self.cache.objs) if not n.startswith('.'))
+
+    def assertColumnsEqual(self, cols1, cols2):
+        self.assertEqual(cols1[0], cols2[0])
+        self.assertEqual(list(cols1[1]), list(cols2[1]))
+        self.assertTrue(np.array_equal(cols1[2], cols2[2]))
+        self.assertEqual(sorted(cols1[3]), sorted(cols2[3]))
+        for k in cols1[3]:
+            self.assertTrue(np.array_equal(cols1[3][k], cols2[3][k]))
+
+    def test_hit(self):
+        cols = self.cache.read_columns(self.files[0], self.keys)
+        self.assertEqual(len(self.entries()), 1)
+
+        # a hit never parses the file again
+        with mock.patch('statcache.Stat', side_effect=AssertionError):
+            self.assertColumnsEqual(self.cache.read_columns(self.files[0], self.keys), cols)
+
+            # neither does touching it, since its content is the same
+            os.utime(self.files[0], (time.time() + 10, time.time() + 10))
+            self.assertColumnsEqual(self.cache.read_columns(self.files[0], self.keys), cols)
+
+        self.assertEqual(len(self.entries()), 1)
+
+    def test_miss(self):
+        self.cache.read_columns(self.files[0], self.keys)
+
+        # other keys and other content make new entries
+        self.cache.read_columns(self.files[0], ['status'])
+        self.assertEqual(len(self.entries()), 2)
+
+        self.write(self.files[0], 7)
+        os.utime(self.files[0], (time.time() + 10, time.time() + 10))
+        cols = self.cache.read_columns(self.files[0], self.keys)
+        self.assertEqual(len(self.entries()), 3)
+        self.assertEqual(cols[0]['program'], 'solver7')
+        self.assertEqual(float(cols[3]['rtime'][0]), 7.0)
+
+    def test_evict_age(self):
+        for fn in self.files:
+            self.cache.read_columns(fn, self.keys)
+
+        old = time.time() - 3 * 86400
+        entry = self.cache.entry(self.files[0], self.keys)
+        os.utime(entry, (old, old))
+
+        self.cache.max_age = 1
+        self.cache.evict()
+
+        self.assertEqual(self.entries(), [os.path.basename(self.cache.entry(self.files[1], self.keys))])
+        self.assertEqual(len(os.listdir(self.cache.refs)), 1)
+
+    def test_evict_size(self):
+        for fn in self.files:
+            self.cache.read_columns(fn, self.keys)
+
+        entries = [self.cache.entry(fn, self.keys) for fn in self.files]
+        os.utime(entries[0], (time.time() - 20, time.time() - 20))
+        os.utime(entries[1], (time.time() - 10, time.time() - 10))
+
+        # reading the first file makes it the most recently used
+        self.cache.read_columns(self.files[0], self.keys)
+
+        size = sum(os.path.getsize(os.path.join(entries[0], f)) for f in os.listdir(entries[0]))
+        self.cache.max_size = 1.5 * size / 1048576
+        self.cache.evict()
+
+        self.assertEqual(self.entries(), [os.path.basename(entries[0])])
+
+
+#
+#==============================================================================
+if __name__ == '__main__':
+    unittest.main()
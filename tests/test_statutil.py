@@ -0,0 +1,176 @@
+#!/usr/bin/env python
+#-*- coding:utf-8 -*-
+##
+## test_statutil.py
+##
+##  Created on: Oct 17, 2026
+##
+
+#
+#==============================================================================
+import gzip
+import io
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from statutil import Stat, StatArray, StatReader, StatView
+
+
+#
+#==============================================================================
+class StatReaderTest(unittest.TestCase):
+    """
+        Streaming STAT files and keeping only the requested keys.
+    """
+
+    def setUp(self):
+        self.data = {
+            'preamble': {'program': 'solver', 'prog_args': '-v "x"', 'benchmark': 'bench'},
+            'comment': [1, {'a': None}],
+            'stats': {
+                'inst1': {'status': True, 'rtime': 1234.5678, 'mempeak': '171864 KiB', 'trace': [1, 2, 3]},
+                'inst\u00e92': {'status': False, 'rtime': 1e-07, 'conflicts': 123456789},
+                'inst3': {'rtime': 3}
+            }
+        }
+
+        self.text = json.dumps(self.data, indent=2)
+
+    def expected(self, keys):
+        return {inst: {k: rec[k] for k in keys if k in rec}
+                for inst, rec in self.data['stats'].items()}
+
+    def test_projection(self):
+        keys = ['status', 'rtime']
+
+        # tiny chunks split names, strings and numbers between reads
+        for chunk_sz in (1, 3, 7, 65536):
+            preamble, stats = StatReader(io.StringIO(self.text), chunk_sz=chunk_sz).read(keys)
+            self.assertEqual(preamble, self.data['preamble'])
+            self.assertEqual(stats, self.expected(keys))
+
+    def test_compact(self):
+        text = json.dumps(self.data, separators=(',', ':'))
+        preamble, stats = StatReader(io.StringIO(text), chunk_sz=5).read(['conflicts'])
+        self.assertEqual(stats, self.expected(['conflicts']))
+
+    def test_stat_keys(self):
+        tmp = tempfile.mkdtemp()
+        try:
+            fn = os.path.join(tmp, 'solver.json')
+            with open(fn, 'w') as fp:
+                fp.write(self.text)
+
+            stat_obj = Stat(fn, keys=['status', 'rtime'])
+            self.assertEqual(stat_obj.data, self.expected(['status', 'rtime']))
+            self.assertEqual(stat_obj.preamble['program'], 'solver')
+        finally:
+            shutil.rmtree(tmp)
+
+    def test_truncated(self):
+        with self.assertRaises(ValueError):
+            StatReader(io.StringIO(self.text[:-10]), chunk_sz=4).read(['rtime'])
+
+
+#
+#==============================================================================
+class StatViewTest(unittest.TestCase):
+    """
+        Updating and writing the views of an array read with keys.
+    """
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.fn = os.path.join(self.tmp, 'solver.json')
+
+        stats = {
+            'inst1': {'status': True, 'rtime': 1.5, 'conflicts': 12, 'mempeak': '171864 KiB', 'segfault': 'yes'},
+            'inst2': {'status': True, 'rtime': 2.5, 'mempeak': '57261 KiB'},
+            'inst3': {'status': False, 'rtime': 1000.0, 'mempeak': '245759 KiB'}
+        }
+
+        with open(self.fn, 'w') as fp:
+            json.dump({'preamble': {'program': 'solver', 'prog_args': '',
+                'benchmark': 'bench'}, 'stats': stats}, fp)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def test_update_projected(self):
+        stat_arr = StatArray([self.fn], keys=['status', 'rtime'])
+        self.assertTrue(isinstance(stat_arr[0], StatView))
+
+        stat_arr.update(failure='segfault')
+
+        row = stat_arr.core.row('inst1')
+        self.assertFalse(stat_arr.core.status[0, row])
+        self.assertTrue(stat_arr.core.status[0, stat_arr.core.row('inst2')])
+
+        # the file is written back with its non-numeric keys
+        stat_obj = Stat(self.fn)
+        self.assertFalse(stat_obj.data['inst1']['status'])
+        self.assertTrue(stat_obj.data['inst2']['status'])
+        self.assertEqual(stat_obj.data['inst1']['mempeak'], '171864 KiB')
+        self.assertEqual(stat_obj.data['inst1']['segfault'], 'yes')
+
+    def test_write_projected(self):
+        stat_arr = StatArray([self.fn], keys=['status', 'rtime'])
+        stat_arr.core.status[0, stat_arr.core.row('inst2')] = False
+
+        to = os.path.join(self.tmp, 'copy.json')
+        stat_arr.write([to])
+
+        stat_obj = Stat(to)
+        self.assertEqual(sorted(stat_obj.data), ['inst1', 'inst2', 'inst3'])
+        self.assertFalse(stat_obj.data['inst2']['status'])
+        self.assertEqual(stat_obj.data['inst2']['mempeak'], '57261 KiB')
+
+    def test_update_compressed(self):
+        fn = self.fn + '.gz'
+        with open(self.fn, 'rb') as fp, gzip.open(fn, 'wb') as gz:
+            gz.write(fp.read())
+
+        stat_arr = StatArray([fn], keys=['status', 'rtime'])
+        stat_arr.update(failure='segfault')
+
+        with open(fn, 'rb') as fp:
+            self.assertEqual(fp.read(2), b'\x1f\x8b')
+
+        stat_obj = Stat(fn)
+        self.assertFalse(stat_obj.data['inst1']['status'])
+        self.assertEqual(stat_obj.data['inst1']['mempeak'], '171864 KiB')
+
+    def test_int_values(self):
+        stat_arr = StatArray([self.fn], keys=['status', 'conflicts'])
+
+        # the matrix stores floats, the full records keep the original types
+        self.assertEqual(stat_arr[0].data['inst1'], {'status': True, 'conflicts': 12.0})
+        self.assertTrue(type(stat_arr[0].data['inst1']['conflicts']) is float)
+        self.assertTrue(type(stat_arr[0].full().data['inst1']['conflicts']) is int)
+
+        to = os.path.join(self.tmp, 'copy.json')
+        stat_arr.write([to])
+        self.assertTrue(type(Stat(to).data['inst1']['conflicts']) is int)
+
+    def test_cluster_mixed(self):
+        stat_arr = StatArray([self.fn])
+        stat_arr.make_vbs()
+        self.assertTrue(isinstance(stat_arr[1], StatView))
+
+        stat_arr.cluster(use_key='program')
+
+        self.assertEqual([stat_obj.preamble['program'] for stat_obj in stat_arr], ['solver', 'vbs'])
+        self.assertEqual(stat_arr[1].insts_own, ['inst1@bench', 'inst2@bench', 'inst3@bench'])
+        self.assertEqual(stat_arr.core.status.sum(axis=1).tolist(), [2, 2])
+
+
+#
+#==============================================================================
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python
+#-*- coding:utf-8 -*-
+##
+## util.py
+##
+##  Created on: Oct 17, 2026
+##
+
+#
+#==============================================================================
+import numpy as np
+
+
+#
+#==============================================================================
+def make_batches(resamples, size, seed):
+    """
+        Splits resamples of the given size into batches of weight
+        matrices small enough to be kept in memory. Each batch gets
+        its own seed, so the result does not depend on the number of
+        processes.
+    """
+
+    step = max(1, min(resamples, (1 << 24) // max(1, size)))
+    counts = [min(step, resamples - i) for i in range(0, resamples, step)]
+
+    seeds = np.random.SeedSequence(seed).spawn(len(counts))
+    return [(count, size, ss) for count, ss in zip(counts, seeds)]
+
+
+#
+#==============================================================================
+def weights(count, size, rng):
+    """
+        Draws count resamples of size items, each being the vector of the
+        numbers of times the items are drawn.
+    """
+
+    idx = rng.integers(0, size, (count, size)) + size * np.arange(count)[:, None]
+    return np.bincount(idx.ravel(), minlength=count * size).reshape(count, size).astype(np.float64)
+
+
+#
+#==============================================================================
+def band(vals, points, resamples, conf, seed):
+    """
+        Computes the confidence band of a cactus line given its values
+        (in any order). For each of the given points of the line (the
+        indices of the sorted values), the band spans the numbers of
+        resampled instances having at most the value of the point.
+        Returns the lower and upper bounds at the points.
+    """
+
+    order = np.argsort(vals, kind='stable')
+    counts = []
+
+    for count, size, ss in make_batches(resamples, len(vals), seed):
+        w = weights(count, size, np.random.default_rng(ss))
+        counts.append(np.cumsum(w[:, order], axis=1)[:, points])
+
+    return np.percentile(np.vstack(counts), [50 * (1 - conf), 50 * (1 + conf)], axis=0)
+
+
+#
+#==============================================================================
+def tex_escape(text):
+    """
+        Escapes LaTeX special characters in a text, except in its math
+        parts (delimited by dollar signs).
+    """
+
+    parts = text.split('$')
+    for i in range(0, len(parts), 2):
+        for c in ('&', '%', '#', '_'):
+            parts[i] = parts[i].replace(c, '\\' + c)
+
+    return '$'.join(parts)